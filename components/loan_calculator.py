@@ -1,18 +1,23 @@
 import streamlit as st
 import plotly.graph_objects as go
 import plotly.express as px
+import numpy as np
 import pandas as pd
-from utils.financial_calculations import (
-    calculate_emi,
-    calculate_total_interest,
-    optimize_prepayment_strategy,
-    get_loan_recommendations
-)
-from utils.data_processing import generate_loan_amortization
+from utils.loan_session import LoanSession
+from utils.financial_calculations import calculate_max_eligible_loan, build_eligibility_grid
+
+# Eligibility heatmap axes; every rate the input allows is precomputed at once
+ELIGIBILITY_TENURES = np.arange(5, 31, 5)
+ELIGIBILITY_RATES = np.round(np.arange(1.0, 30.05, 0.1), 1)
 
 def render_loan_calculator():
     st.header("Advanced Loan Calculator")
 
+    # Per-user what-if model: reruns only recompute stages whose inputs changed
+    if 'loan_session' not in st.session_state:
+        st.session_state.loan_session = LoanSession()
+    session = st.session_state.loan_session
+
     # Input Section
     with st.container():
         col1, col2, col3 = st.columns(3)
@@ -73,8 +78,8 @@ def render_loan_calculator():
             )
 
     # Calculate basic metrics
-    emi = calculate_emi(loan_amount, interest_rate, tenure)
-    total_interest = calculate_total_interest(loan_amount, emi, tenure)
+    emi = session.emi(loan_amount, interest_rate, tenure)
+    total_interest = session.total_interest(loan_amount, emi, tenure)
 
     # Display key metrics
     st.subheader("Loan Overview")
@@ -89,7 +94,7 @@ def render_loan_calculator():
     # Prepayment Analysis
     if monthly_surplus > 0:
         st.subheader("Prepayment Analysis")
-        optimal_strategy = optimize_prepayment_strategy(
+        optimal_strategy, savings_curve = session.prepayment(
             loan_amount, interest_rate, tenure, monthly_surplus
         )
 
@@ -106,10 +111,29 @@ def render_loan_calculator():
                 f"Save {optimal_strategy['time_saved_months']} months"
             )
 
+        # Savings at every prepayment level
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(
+            x=savings_curve['monthly_prepayment'],
+            y=savings_curve['interest_saved'],
+            mode='lines+markers',
+            name='Interest Saved',
+            line=dict(color='#4ECDC4')
+        ))
+        fig.update_layout(
+            title='Interest Saved vs Monthly Prepayment',
+            xaxis_title='Monthly Prepayment (₹)',
+            yaxis_title='Interest Saved (₹)',
+            template='plotly_white',
+            height=400
+        )
+
+        st.plotly_chart(fig, use_container_width=True)
+
     # Personalized Recommendations
     if monthly_income > 0:
         st.subheader("Personalized Recommendations")
-        recommendations = get_loan_recommendations(
+        recommendations = session.recommendations(
             monthly_income, emi, existing_emi
         )
         for rec in recommendations:
@@ -120,6 +144,41 @@ def render_loan_calculator():
             else:
                 st.success(rec['message'])
 
+        # Loan Eligibility
+        st.subheader("Loan Eligibility")
+        foir = st.slider(
+            "FOIR Cap (% of income for all EMIs)",
+            min_value=20,
+            max_value=70,
+            value=50,
+            step=5,
+            help="Fixed Obligation to Income Ratio lenders allow"
+        )
+        max_loan = float(calculate_max_eligible_loan(monthly_income, interest_rate, tenure, foir, existing_emi))
+        st.metric(
+            "Maximum Eligible Loan",
+            f"₹{max_loan:,.0f}",
+            f"₹{max_loan - loan_amount:,.0f} vs requested"
+        )
+
+        incomes = np.round(monthly_income * np.linspace(0.5, 2.0, 16), -3)
+        grid = build_eligibility_grid(incomes, ELIGIBILITY_TENURES, ELIGIBILITY_RATES, foir, existing_emi)
+        rate_index = int(np.abs(grid['rate'] - interest_rate).argmin())
+
+        fig = px.imshow(
+            grid['max_loan'][:, :, rate_index] / 1e5,
+            x=[f"{t} yrs" for t in grid['tenure']],
+            y=[f"₹{i:,.0f}" for i in grid['income']],
+            labels=dict(x='Tenure', y='Monthly Income', color='Max Loan (₹ lakh)'),
+            color_continuous_scale='Tealgrn',
+            text_auto='.1f',
+            aspect='auto',
+            title=f'Maximum Eligible Loan (₹ lakh) at {grid["rate"][rate_index]:.1f}%'
+        )
+        fig.update_layout(template='plotly_white', height=500)
+
+        st.plotly_chart(fig, use_container_width=True)
+
     # Visualization Section
     st.subheader("Loan Analysis Visualizations")
 
@@ -127,7 +186,7 @@ def render_loan_calculator():
 
     with tab1:
         # Generate amortization schedule
-        schedule = generate_loan_amortization(loan_amount, interest_rate, tenure)
+        schedule = session.amortization(loan_amount, interest_rate, tenure)
 
         fig = go.Figure()
         fig.add_trace(go.Bar(
@@ -170,4 +229,8 @@ def render_loan_calculator():
         )
         fig.update_traces(textposition='inside', textinfo='percent+label')
 
-        st.plotly_chart(fig, use_container_width=True)
\ No newline at end of file
+        st.plotly_chart(fig, use_container_width=True)
+
+    # Cache effectiveness for this session
+    with st.expander("Computation Stats"):
+        st.dataframe(session.stats_frame(), hide_index=True)
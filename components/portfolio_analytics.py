@@ -5,10 +5,13 @@ import pandas as pd
 import numpy as np
 from utils.advanced_analytics import (
     project_portfolio_growth,
-    stress_test_portfolio,
+    run_stress_tests,
     calculate_portfolio_metrics,
+    calculate_efficient_frontier,
+    solve_goal,
     generate_investment_recommendations
 )
+from utils.historical_replay import replay_stress_test
 
 def render_portfolio_analytics():
     st.header("Advanced Portfolio Analytics")
@@ -124,6 +127,58 @@ def render_portfolio_analytics():
     
     st.plotly_chart(fig, use_container_width=True)
     
+    # Goal Planner
+    st.subheader("Goal Planner")
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        goal_amount = st.number_input(
+            "Target Corpus (₹)",
+            min_value=10000,
+            value=20000000,
+            step=100000
+        )
+    with col2:
+        goal_probability = st.slider(
+            "Required Probability of Success (%)",
+            min_value=50,
+            max_value=99,
+            value=90
+        )
+    with col3:
+        solve_for = st.selectbox(
+            "Solve For",
+            ["monthly_investment", "time_horizon", "initial_amount"],
+            format_func=lambda x: {
+                'monthly_investment': 'Monthly SIP',
+                'time_horizon': 'Investment Horizon',
+                'initial_amount': 'Initial Investment'
+            }[x]
+        )
+    
+    goal = solve_goal(
+        goal_amount,
+        goal_probability / 100,
+        solve_for,
+        initial_amount=initial_investment,
+        monthly_investment=monthly_sip,
+        time_horizon=investment_horizon,
+        expected_return=expected_return,
+        volatility=volatility,
+        rng=np.random.default_rng(0)
+    )
+    
+    if goal['value'] is None:
+        st.warning(
+            f"The target is out of reach: best achievable probability is {goal['probability']:.0%}."
+        )
+    elif solve_for == 'time_horizon':
+        st.metric("Required Horizon", f"{goal['value']:.1f} years", f"{goal['probability']:.0%} chance")
+    elif solve_for == 'monthly_investment':
+        st.metric("Required Monthly SIP", f"₹{goal['value']:,.0f}", f"{goal['probability']:.0%} chance")
+    else:
+        st.metric("Required Initial Investment", f"₹{goal['value']:,.0f}", f"{goal['probability']:.0%} chance")
+    
     # Stress Testing
     st.subheader("Stress Testing")
     
@@ -135,24 +190,14 @@ def render_portfolio_analytics():
         'Real Estate': initial_investment * 0.05
     }
     
-    scenarios = ['market_crash', 'interest_rate_hike', 'currency_crisis']
-    stress_results = {}
-    
-    for scenario in scenarios:
-        stress_results[scenario] = stress_test_portfolio(portfolio, scenario)
+    # Apply every registered scenario in one vectorized pass
+    stress_df = run_stress_tests(portfolio)
     
-    # Create stress test visualization
-    stress_data = []
-    for scenario in scenarios:
-        for asset, value in stress_results[scenario].items():
-            stress_data.append({
-                'Scenario': scenario.replace('_', ' ').title(),
-                'Asset': asset,
-                'Value': value,
-                'Change': (value - portfolio[asset]) / portfolio[asset] * 100
-            })
-    
-    stress_df = pd.DataFrame(stress_data)
+    if st.checkbox("Include historical replays (2008, 2013, 2020)"):
+        try:
+            stress_df = pd.concat([stress_df, replay_stress_test(portfolio)], ignore_index=True)
+        except ValueError as e:
+            st.warning(f"Historical replays unavailable: {e}")
     
     fig = px.bar(
         stress_df,
@@ -166,6 +211,50 @@ def render_portfolio_analytics():
     
     st.plotly_chart(fig, use_container_width=True)
     
+    # Efficient Frontier
+    st.subheader("Efficient Frontier")
+    
+    frontier = calculate_efficient_frontier(risk_free_rate=risk_free_rate / 100)
+    tangency = frontier['tangency']
+    
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=frontier['risks'] * 100,
+        y=frontier['returns'] * 100,
+        mode='lines+markers',
+        name='Efficient Frontier',
+        line=dict(color='#66B2FF')
+    ))
+    fig.add_trace(go.Scatter(
+        x=[tangency['risk'] * 100],
+        y=[tangency['expected_return'] * 100],
+        mode='markers',
+        name='Optimal (Max Sharpe)',
+        marker=dict(color='#FF9999', size=14, symbol='star')
+    ))
+    fig.update_layout(
+        title='Risk vs Return of Optimal Allocations',
+        xaxis_title='Risk (%)',
+        yaxis_title='Expected Return (%)',
+        template='plotly_white',
+        height=450
+    )
+    
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        st.plotly_chart(fig, use_container_width=True)
+    with col2:
+        st.metric("Optimal Expected Return", f"{tangency['expected_return'] * 100:.2f}%")
+        st.metric("Optimal Risk", f"{tangency['risk'] * 100:.2f}%")
+        st.metric("Sharpe Ratio", f"{tangency['sharpe_ratio']:.2f}")
+        st.dataframe(
+            pd.DataFrame([
+                {'Asset': k, 'Weight (%)': round(v * 100, 1)}
+                for k, v in tangency['weights'].items()
+            ]),
+            hide_index=True
+        )
+    
     # Investment Recommendations
     st.subheader("Personalized Recommendations")
     recommendations = generate_investment_recommendations(
@@ -1,18 +1,42 @@
 import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
+import numpy as np
 import pandas as pd
+from utils.tax_surfaces import (
+    SURFACE_MAX_INCOME,
+    load_tax_surface,
+    marginal_tax_rates,
+    find_breakeven_incomes
+)
 from utils.indian_tax_calculator import (
     calculate_80c_deduction,
     calculate_80d_deduction,
     calculate_ppf_maturity,
     calculate_nps_returns,
     calculate_fd_returns,
-    calculate_tax_liability
+    calculate_tax_liability,
+    optimize_deduction_allocation,
+    available_financial_years,
+    get_tax_rules,
+    DEFAULT_FINANCIAL_YEAR
 )
 
 def render_tax_calculator():
     st.header("Indian Tax & Investment Calculator")
+
+    financial_years = available_financial_years()
+    financial_year = st.selectbox(
+        "Financial Year",
+        financial_years,
+        index=financial_years.index(DEFAULT_FINANCIAL_YEAR),
+        format_func=lambda fy: f"FY {fy}"
+    )
+    deduction_limits = get_tax_rules(financial_year)['deduction_limits']
+
+    # Memory-map the precomputed tax surfaces once; lookups below never recompute slabs
+    for surface_regime in ['old', 'new']:
+        load_tax_surface(financial_year, surface_regime)
     
     # Tab layout for different calculators
     tabs = st.tabs([
@@ -24,7 +48,7 @@ def render_tax_calculator():
     
     # Income Tax Calculator
     with tabs[0]:
-        st.subheader("Income Tax Calculator (FY 2024-25)")
+        st.subheader(f"Income Tax Calculator (FY {financial_year})")
         
         col1, col2 = st.columns(2)
         with col1:
@@ -45,7 +69,7 @@ def render_tax_calculator():
                 deductions_80c = st.number_input(
                     "80C Investments (₹)",
                     min_value=0,
-                    max_value=150000,
+                    max_value=deduction_limits['80c'],
                     value=0,
                     step=1000
                 )
@@ -69,7 +93,8 @@ def render_tax_calculator():
             deductions_80c,
             deductions_80d,
             other_deductions,
-            regime
+            regime,
+            financial_year
         )
         
         # Display tax calculation results
@@ -130,6 +155,43 @@ def render_tax_calculator():
         )
         
         st.plotly_chart(fig, use_container_width=True)
+
+        # Sensitivity read off the precomputed surfaces
+        st.subheader("Tax Sensitivity")
+        claimed_deductions = deductions_80c + deductions_80d + other_deductions
+        incomes = np.arange(0, SURFACE_MAX_INCOME + 10000, 10000)
+
+        fig = go.Figure()
+        for surface_regime, color in [('old', '#FF6B6B'), ('new', '#4ECDC4')]:
+            fig.add_trace(go.Scatter(
+                x=incomes,
+                y=marginal_tax_rates(incomes, claimed_deductions, financial_year, surface_regime) * 100,
+                mode='lines',
+                line_shape='hv',
+                name=f"{surface_regime.title()} Regime",
+                line=dict(color=color)
+            ))
+        fig.add_vline(x=gross_income, line_dash='dash', line_color='gray')
+        fig.update_layout(
+            title='Marginal Tax Rate by Income (incl. cess)',
+            xaxis_title='Annual Gross Income (₹)',
+            yaxis_title='Marginal Rate (%)',
+            template='plotly_white',
+            height=400
+        )
+
+        st.plotly_chart(fig, use_container_width=True)
+
+        breakevens = find_breakeven_incomes(claimed_deductions, financial_year)
+        if breakevens:
+            st.info(
+                "With ₹{:,.0f} of deductions, both regimes cost the same at an income of {}.".format(
+                    claimed_deductions,
+                    ", ".join(f"₹{income:,.0f}" for income in breakevens)
+                )
+            )
+        else:
+            st.info(f"With ₹{claimed_deductions:,.0f} of deductions, the cheaper regime is the same at every income.")
     
     # Investment Calculator
     with tabs[1]:
@@ -229,7 +291,8 @@ def render_tax_calculator():
             ppf_investment,
             elss_investment,
             life_insurance,
-            nps_tier1
+            nps_tier1,
+            financial_year=financial_year
         )
         
         st.metric(
@@ -260,6 +323,54 @@ def render_tax_calculator():
                 title='80C Investment Distribution'
             )
             st.plotly_chart(fig, use_container_width=True)
+
+        # Best split of a savings budget across tax-saving instruments
+        st.subheader("Optimal Tax-Saving Allocation")
+        savings_budget = st.number_input(
+            "Annual Savings Budget (₹)",
+            min_value=0,
+            value=150000,
+            step=5000,
+            help=(
+                f"Split across the 80C, NPS 80CCD(1B) and 80D headroom left after the deductions "
+                f"already entered above, for the ₹{gross_income:,.0f} income"
+            )
+        )
+
+        allocation = optimize_deduction_allocation(
+            gross_income,
+            savings_budget,
+            other_deductions,
+            existing_80c=deductions_80c,
+            existing_80d=deductions_80d,
+            financial_year=financial_year
+        )
+
+        allocation_table = pd.DataFrame([
+            {
+                'Regime': f"{name.title()} Regime",
+                'PPF': allocation[name]['ppf'],
+                'ELSS': allocation[name]['elss'],
+                'NPS 80CCD(1B)': allocation[name]['nps'],
+                'Health Insurance': allocation[name]['health_insurance'],
+                'Total Investment': allocation[name]['total_investment'],
+                'Total Tax': allocation[name]['total_tax'],
+                'Tax Saved': allocation[name]['tax_saved']
+            }
+            for name in ['old', 'new']
+        ])
+        st.dataframe(
+            allocation_table.style.format({
+                column: '₹{:,.0f}' for column in allocation_table.columns if column != 'Regime'
+            }),
+            hide_index=True
+        )
+
+        best = allocation[allocation['recommended_regime']]
+        st.success(
+            f"Best option: {allocation['recommended_regime'].title()} Regime, investing "
+            f"₹{best['total_investment']:,.0f} for a total tax of ₹{best['total_tax']:,.2f}"
+        )
     
     # Retirement Planning
     with tabs[3]:
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+from utils.paise import _reference_emi, emi_paise, loan_summary_paise, reference_loan_summary
+
+SUMMARY_KEYS = ['emi', 'total_interest', 'total_payment', 'final_payment']
+
+def _assert_matches_reference(principal, rate, tenure):
+    summary = loan_summary_paise(principal, rate, tenure)
+    for k in range(len(principal)):
+        expected = reference_loan_summary(principal[k], rate[k], tenure[k])
+        for key in SUMMARY_KEYS:
+            assert int(summary[key][k]) == expected[key], (key, principal[k], rate[k], tenure[k])
+
+def test_random_loans_match_reference():
+    rng = np.random.default_rng(20240601)
+    count = 300
+    principal = np.round(rng.uniform(1000, 5_000_000, count), 2)
+    rate = np.round(rng.uniform(0.5, 18, count), 3)
+    tenure = rng.integers(1, 31, count)
+    _assert_matches_reference(principal, rate, tenure)
+
+def test_zero_rate_loans_match_reference():
+    principal = np.array([1000.0, 12345.67, 999999.99, 0.07])
+    rate = np.zeros(len(principal))
+    tenure = np.array([1, 3, 20, 1])
+    _assert_matches_reference(principal, rate, tenure)
+
+    summary = loan_summary_paise(principal, rate, tenure)
+    assert (summary['total_interest'] == 0).all()
+
+def test_half_paisa_ties_round_up():
+    # 12k + 6 paise over 12 months is an EMI of exactly k + 0.5 paise
+    principal = (12 * np.array([1, 833, 250_000]) + 6) / 100
+    rate = np.zeros(len(principal))
+    tenure = np.ones(len(principal), dtype=int)
+    _assert_matches_reference(principal, rate, tenure)
+    assert loan_summary_paise(principal, rate, tenure)['emi'].tolist() == [2, 834, 250_001]
+
+@pytest.mark.parametrize('principal, rate_units, months', [
+    (3, 0, 2),
+    (1_000_001, 0, 2),
+    (10_000_000, 85_000, 240),
+])
+def test_emi_paise_matches_decimal_emi(principal, rate_units, months):
+    emi = emi_paise(np.array([principal]), np.array([rate_units]), np.array([months]))
+    assert int(emi[0]) == _reference_emi(principal, rate_units, months)
+
+@pytest.mark.parametrize('start, rate_units, months', [
+    (1_000_000, 87_500, 120),
+    # ₹100-crore principals, where float error in the EMI exceeds 1e-6 paise
+    (100_000_000_000, 87_500, 180),
+    (100_000_000_000, 62_500, 60),
+    # Tiny rates, where (1 + r)^n - 1 loses most of its digits
+    (100_000_000_000, 3, 360),
+])
+def test_near_tie_emis_match_decimal_emi(start, rate_units, months):
+    # The loans whose float EMI lands closest to a half paisa
+    principal = np.arange(start, start + 200_000, dtype=np.int64)
+    rate_units = np.full(len(principal), rate_units, dtype=np.int64)
+    months = np.full(len(principal), months, dtype=np.int64)
+    rate = rate_units / (12 * 100 * 10_000)
+    exact = principal * rate / -np.expm1(-months * np.log1p(rate))
+    closest = np.argsort(np.abs(exact - np.floor(exact) - 0.5))[:300]
+
+    emi = emi_paise(principal[closest], rate_units[closest], months[closest])
+    expected = [_reference_emi(int(principal[k]), int(rate_units[k]), int(months[k])) for k in closest]
+    assert emi.tolist() == expected
+    _assert_matches_reference(principal[closest][:50] / 100, rate_units[closest][:50] / 10_000, months[closest][:50] // 12)
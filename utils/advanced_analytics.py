@@ -1,5 +1,13 @@
+import os
+import json
+import time
 import numpy as np
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from scipy.optimize import minimize
+from scipy.special import ndtri
+from scipy.stats import qmc
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime, timedelta
 
@@ -7,6 +15,186 @@ def calculate_volatility(returns: pd.Series, window: int = 30) -> float:
     """Calculate rolling volatility of returns."""
     return returns.rolling(window=window).std() * np.sqrt(252)
 
+def _simulate_paths(
+    initial_amount: float,
+    monthly_investment: float,
+    monthly_returns: np.ndarray
+) -> np.ndarray:
+    """
+    Build portfolio value paths from a (paths x months) matrix of returns.
+    Uses V_m = G_m * (V_0 + c * sum(1 / G_k)) where G is the cumulative growth.
+    """
+    growth = np.cumprod(1 + monthly_returns, axis=-1)
+    contributions = np.cumsum(1 / growth, axis=-1)
+    return growth * (initial_amount + monthly_investment * contributions)
+
+# Value range tracked by the streaming quantile sketch (₹1 to ₹10 lakh crore)
+SKETCH_MIN_VALUE = 1.0
+SKETCH_MAX_VALUE = 1e13
+
+def _new_quantile_sketch(months: int, relative_accuracy: float) -> Dict:
+    """
+    Create an empty per-month log-bucket quantile sketch (DDSketch style).
+    Bucket k holds values in (gamma^(k-1), gamma^k]; column 0 counts values <= 0.
+    """
+    gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+    log_gamma = np.log(gamma)
+    min_key = int(np.floor(np.log(SKETCH_MIN_VALUE) / log_gamma))
+    max_key = int(np.ceil(np.log(SKETCH_MAX_VALUE) / log_gamma))
+    return {
+        'gamma': gamma,
+        'min_key': min_key,
+        'max_key': max_key,
+        'counts': np.zeros((months, max_key - min_key + 2), dtype=np.int64)
+    }
+
+def _update_quantile_sketch(sketch: Dict, values: np.ndarray) -> None:
+    """Add a (paths x months) block of values to the sketch in place."""
+    counts = sketch['counts']
+    months, width = counts.shape
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        keys = np.ceil(np.log(values) / np.log(sketch['gamma']))
+    columns = np.clip(keys, sketch['min_key'], sketch['max_key']) - sketch['min_key'] + 1
+    columns = np.where(values > 0, columns, 0).astype(np.int64)
+    
+    flat_index = columns + np.arange(months) * width
+    counts += np.bincount(flat_index.ravel(), minlength=counts.size).reshape(counts.shape)
+
+def _sketch_percentiles(sketch: Dict, percentiles: List[float]) -> np.ndarray:
+    """Estimate per-month percentiles from the sketch, shaped like np.percentile."""
+    counts = sketch['counts']
+    gamma = sketch['gamma']
+    cumulative = np.cumsum(counts, axis=1)
+    total = cumulative[:, -1]
+    
+    def value_at_rank(rank: np.ndarray) -> np.ndarray:
+        column = (cumulative <= rank[:, None]).sum(axis=1)
+        key = column - 1 + sketch['min_key']
+        value = 2 * gamma ** key.astype(float) / (gamma + 1)
+        return np.where(column > 0, value, 0.0)
+    
+    # Interpolate between neighbouring ranks the same way np.percentile does
+    estimates = []
+    for q in percentiles:
+        position = q / 100 * (total - 1)
+        lower = np.floor(position)
+        fraction = position - lower
+        lower_value = value_at_rank(lower)
+        upper_value = value_at_rank(np.minimum(lower + 1, total - 1))
+        estimates.append(lower_value + fraction * (upper_value - lower_value))
+    
+    return np.array(estimates)
+
+# Paths per block when streaming or splitting work across processes
+DEFAULT_CHUNK_SIZE = 5000
+
+# Shock generators accepted by project_portfolio_growth
+SAMPLING_METHODS = ['pseudo', 'antithetic', 'sobol']
+
+def _draw_monthly_returns(
+    rng: np.random.Generator,
+    simulations: int,
+    months: int,
+    monthly_return: float,
+    monthly_vol: float,
+    sampling: str = 'pseudo'
+) -> np.ndarray:
+    """
+    Draw a (simulations x months) matrix of monthly returns.
+    'antithetic' mirrors each shock path; 'sobol' uses scrambled Sobol points.
+    """
+    if sampling == 'pseudo':
+        return rng.normal(monthly_return, monthly_vol, (simulations, months))
+    elif sampling == 'antithetic':
+        shocks = rng.standard_normal(((simulations + 1) // 2, months))
+        shocks = np.concatenate([shocks, -shocks])[:simulations]
+    elif sampling == 'sobol':
+        # Sobol' balance needs a power-of-two sample, so draw the next one up and slice
+        exponent = max(int(np.ceil(np.log2(max(simulations, 1)))), 0)
+        points = qmc.Sobol(d=months, scramble=True, seed=rng).random_base2(exponent)[:simulations]
+        shocks = ndtri(np.clip(points, 1e-12, 1 - 1e-12))
+    else:
+        raise ValueError(f"Unknown sampling method: {sampling}")
+    
+    return monthly_return + monthly_vol * shocks
+
+def _stream_paths(
+    sketch: Dict,
+    rng: np.random.Generator,
+    simulations: int,
+    chunk_size: int,
+    sampling: str,
+    initial_amount: float,
+    monthly_investment: float,
+    monthly_return: float,
+    monthly_vol: float
+) -> None:
+    """Simulate paths in fixed-size blocks and fold each block into the sketch."""
+    months = sketch['counts'].shape[0]
+    for start in range(0, simulations, chunk_size):
+        block = min(chunk_size, simulations - start)
+        monthly_returns = _draw_monthly_returns(
+            rng, block, months, monthly_return, monthly_vol, sampling
+        )
+        _update_quantile_sketch(
+            sketch,
+            _simulate_paths(initial_amount, monthly_investment, monthly_returns)
+        )
+
+def _projection_worker(task: Tuple) -> np.ndarray:
+    """Run one process' share of the paths and return its sketch counts."""
+    seed_sequence, simulations, months, chunk_size, relative_accuracy, *path_args = task
+    sketch = _new_quantile_sketch(months, relative_accuracy)
+    _stream_paths(sketch, np.random.default_rng(seed_sequence), simulations, chunk_size, *path_args)
+    return sketch['counts']
+
+def _adaptive_percentiles(
+    rng: np.random.Generator,
+    months: int,
+    tolerance: float,
+    batch_size: int,
+    max_simulations: int,
+    sampling: str,
+    initial_amount: float,
+    monthly_investment: float,
+    monthly_return: float,
+    monthly_vol: float
+) -> Tuple[np.ndarray, np.ndarray, int]:
+    """
+    Add independent batches until the 5th/50th/95th percentile bands converge.
+    Bands are batch means; the standard error is their spread across batches.
+    """
+    min_batches = 4
+    if max_simulations < min_batches * batch_size:
+        raise ValueError(
+            f"max_simulations must be at least {min_batches} batches ({min_batches * batch_size} paths)"
+        )
+    batch_estimates = []
+    simulated = 0
+    
+    while True:
+        # The last batch is trimmed so the run never exceeds max_simulations
+        block = min(batch_size, max_simulations - simulated)
+        monthly_returns = _draw_monthly_returns(
+            rng, block, months, monthly_return, monthly_vol, sampling
+        )
+        simulated += block
+        values = _simulate_paths(initial_amount, monthly_investment, monthly_returns)
+        batch_estimates.append(np.percentile(values, [5, 50, 95], axis=0))
+        
+        batches = len(batch_estimates)
+        if batches < min_batches:
+            continue
+        
+        estimates = np.array(batch_estimates)
+        bands = estimates.mean(axis=0)
+        standard_error = estimates.std(axis=0, ddof=1) / np.sqrt(batches)
+        relative_error = np.max(standard_error / np.maximum(np.abs(bands), 1e-9))
+        
+        if relative_error <= tolerance or simulated >= max_simulations:
+            return bands, standard_error, simulated
+
 def project_portfolio_growth(
     initial_amount: float,
     monthly_investment: float,
@@ -14,33 +202,104 @@ def project_portfolio_growth(
     risk_free_rate: float,
     time_horizon: int,
     volatility: float,
-    simulations: int = 1000
+    simulations: int = 1000,
+    rng: Optional[np.random.Generator] = None,
+    chunk_size: Optional[int] = None,
+    relative_accuracy: float = 0.01,
+    workers: Optional[int] = None,
+    seed: Optional[int] = None,
+    sampling: str = 'pseudo',
+    tolerance: Optional[float] = None,
+    batch_size: int = 1024,
+    max_simulations: int = 100000
 ) -> Dict[str, np.ndarray]:
     """
     Project portfolio growth using Monte Carlo simulation.
     Returns confidence intervals for different scenarios.
+    Pass a seeded `rng` for reproducible projections.
+    
+    With `chunk_size` set, paths are simulated in blocks of that size and
+    folded into a per-month log-bucket sketch, so peak memory depends on
+    `chunk_size` and the horizon only, not on `simulations`. Each reported
+    percentile is then within `relative_accuracy` (default 1%) of the exact
+    sample percentile, for values between SKETCH_MIN_VALUE and SKETCH_MAX_VALUE.
+    
+    With `workers` set, paths are split across a process pool. Each worker
+    gets its own stream spawned from SeedSequence(`seed`) and returns a
+    sketch; the sketches are summed before percentiles are read, so results
+    are bit-identical for a given seed and worker count.
+    
+    `sampling` selects plain ('pseudo'), antithetic or scrambled Sobol shocks.
+    With `tolerance` set, `simulations` is ignored: batches of `batch_size`
+    paths are added until the relative standard error of every band is at
+    most `tolerance` (or `max_simulations` is reached). The result then also
+    carries 'standard_error' per band and the 'simulations' actually run.
     """
+    if sampling not in SAMPLING_METHODS:
+        raise ValueError(f"Unknown sampling method: {sampling}")
+    
     monthly_return = expected_return / 12 / 100
     monthly_vol = volatility / np.sqrt(12) / 100
     months = time_horizon * 12
+    path_args = (initial_amount, monthly_investment, monthly_return, monthly_vol)
     
-    # Initialize array for simulations
-    simulated_returns = np.zeros((simulations, months))
-    
-    for i in range(simulations):
-        monthly_returns = np.random.normal(
-            monthly_return,
-            monthly_vol,
-            months
-        )
-        portfolio_value = initial_amount
-        for m in range(months):
-            portfolio_value *= (1 + monthly_returns[m])
-            portfolio_value += monthly_investment
-            simulated_returns[i, m] = portfolio_value
-    
-    # Calculate confidence intervals
-    percentiles = np.percentile(simulated_returns, [5, 25, 50, 75, 95], axis=0)
+    if workers is not None:
+        if rng is not None:
+            raise ValueError("Pass `seed` instead of `rng` when running with workers")
+        if tolerance is not None:
+            raise ValueError("Adaptive mode does not run with workers")
+        
+        # Split the paths across independent, reproducible worker streams
+        streams = np.random.SeedSequence(seed).spawn(workers)
+        shares = [len(share) for share in np.array_split(np.arange(simulations), workers)]
+        tasks = [
+            (stream, share, months, chunk_size or DEFAULT_CHUNK_SIZE, relative_accuracy, sampling, *path_args)
+            for stream, share in zip(streams, shares)
+        ]
+        
+        if workers == 1:
+            results = [_projection_worker(tasks[0])]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_projection_worker, tasks))
+        
+        sketch = _new_quantile_sketch(months, relative_accuracy)
+        sketch['counts'] = np.sum(results, axis=0)
+        percentiles = _sketch_percentiles(sketch, [5, 25, 50, 75, 95])
+    else:
+        if rng is None:
+            rng = np.random.default_rng()
+        
+        if tolerance is not None:
+            bands, standard_error, simulations_run = _adaptive_percentiles(
+                rng, months, tolerance, batch_size, max_simulations, sampling, *path_args
+            )
+            return {
+                'conservative': bands[0],
+                'moderate': bands[1],
+                'aggressive': bands[2],
+                'time_points': np.arange(1, months + 1),
+                'standard_error': {
+                    'conservative': standard_error[0],
+                    'moderate': standard_error[1],
+                    'aggressive': standard_error[2]
+                },
+                'simulations': simulations_run
+            }
+        elif chunk_size is None:
+            # Draw every monthly shock at once and compound them per path
+            monthly_returns = _draw_monthly_returns(
+                rng, simulations, months, monthly_return, monthly_vol, sampling
+            )
+            simulated_returns = _simulate_paths(initial_amount, monthly_investment, monthly_returns)
+            
+            # Calculate confidence intervals
+            percentiles = np.percentile(simulated_returns, [5, 25, 50, 75, 95], axis=0)
+        else:
+            # Stream fixed-size blocks of paths through the quantile sketch
+            sketch = _new_quantile_sketch(months, relative_accuracy)
+            _stream_paths(sketch, rng, simulations, chunk_size, sampling, *path_args)
+            percentiles = _sketch_percentiles(sketch, [5, 25, 50, 75, 95])
     
     return {
         'conservative': percentiles[0],  # 5th percentile
@@ -49,69 +308,412 @@ def project_portfolio_growth(
         'time_points': np.arange(1, months + 1)
     }
 
+def benchmark_parallel_projection(
+    simulations: int = 100000,
+    time_horizon: int = 30,
+    worker_counts: Optional[List[int]] = None,
+    seed: int = 0
+) -> pd.DataFrame:
+    """
+    Time project_portfolio_growth across worker counts (1 to all cores by default).
+    Returns wall-clock seconds and speedup over a single worker.
+    """
+    if worker_counts is None:
+        cores = os.cpu_count() or 1
+        worker_counts = sorted({2 ** i for i in range(cores.bit_length()) if 2 ** i <= cores} | {cores})
+    
+    timings = []
+    for workers in worker_counts:
+        start = time.perf_counter()
+        project_portfolio_growth(
+            100000, 10000, 12.0, 4.0, time_horizon, 15.0,
+            simulations=simulations,
+            workers=workers,
+            seed=seed
+        )
+        timings.append({'workers': workers, 'seconds': time.perf_counter() - start})
+    
+    results = pd.DataFrame(timings)
+    results['speedup'] = results['seconds'].iloc[0] / results['seconds']
+    return results
+
+# Quantities solve_goal can solve for
+GOAL_TARGETS = ['monthly_investment', 'initial_amount', 'time_horizon']
+
+def solve_goal(
+    goal_amount: float,
+    probability: float,
+    solve_for: str = 'monthly_investment',
+    initial_amount: float = 0,
+    monthly_investment: float = 0,
+    time_horizon: int = 10,
+    expected_return: float = 12.0,
+    volatility: float = 15.0,
+    simulations: int = 2000,
+    max_horizon: int = 40,
+    tolerance: float = 1.0,
+    max_iterations: int = 200,
+    rng: Optional[np.random.Generator] = None
+) -> Dict[str, float]:
+    """
+    Find the monthly SIP, initial investment or horizon (years) that reaches
+    `goal_amount` with at least `probability` (0-1) chance.
+    All candidates are scored on one shared shock matrix (common random
+    numbers), so each bisection step is a vector comparison, not a new
+    simulation. `tolerance` is in ₹ for amounts. Returns the solved 'value'
+    (None if unreachable), the achieved 'probability' and 'iterations'.
+    """
+    if solve_for not in GOAL_TARGETS:
+        raise ValueError(f"Unknown goal target: {solve_for}")
+    if rng is None:
+        rng = np.random.default_rng()
+    
+    months = (max_horizon if solve_for == 'time_horizon' else time_horizon) * 12
+    monthly_returns = _draw_monthly_returns(
+        rng, simulations, months, expected_return / 12 / 100, volatility / np.sqrt(12) / 100
+    )
+    
+    # Path value at month m is growth[:, m] * (initial + sip * contributions[:, m])
+    growth = np.cumprod(1 + monthly_returns, axis=1)
+    contributions = np.cumsum(1 / growth, axis=1)
+    
+    def success(initial: float, sip: float, month: int) -> float:
+        values = growth[:, month - 1] * (initial + sip * contributions[:, month - 1])
+        return float(np.mean(values >= goal_amount))
+    
+    iterations = 0
+    if solve_for == 'time_horizon':
+        # Smallest month whose success probability clears the target
+        best_case = success(initial_amount, monthly_investment, months)
+        if best_case < probability:
+            return {'solve_for': solve_for, 'value': None, 'probability': best_case, 'iterations': 0}
+        low, high = 0, months
+        while high - low > 1:
+            middle = (low + high) // 2
+            if success(initial_amount, monthly_investment, middle) >= probability:
+                high = middle
+            else:
+                low = middle
+            iterations += 1
+        return {
+            'solve_for': solve_for,
+            'value': high / 12,
+            'probability': success(initial_amount, monthly_investment, high),
+            'iterations': iterations
+        }
+    
+    def score(amount: float) -> float:
+        if solve_for == 'monthly_investment':
+            return success(initial_amount, amount, months)
+        return success(amount, monthly_investment, months)
+    
+    if score(0) >= probability:
+        return {'solve_for': solve_for, 'value': 0.0, 'probability': score(0), 'iterations': 0}
+    
+    # Grow the upper bracket until it succeeds, then bisect inside it
+    low, high = 0.0, max(goal_amount / months, 1.0)
+    while score(high) < probability and iterations < max_iterations:
+        low, high = high, high * 2
+        iterations += 1
+    if score(high) < probability:
+        return {'solve_for': solve_for, 'value': None, 'probability': score(high), 'iterations': iterations}
+    
+    while high - low > tolerance and iterations < max_iterations:
+        middle = (low + high) / 2
+        if score(middle) >= probability:
+            high = middle
+        else:
+            low = middle
+        iterations += 1
+    
+    return {
+        'solve_for': solve_for,
+        'value': high,
+        'probability': score(high),
+        'iterations': iterations
+    }
+
+# Asset classes used across the portfolio analytics (annual figures, in %)
+ASSET_CLASSES = ['Equity', 'Debt', 'Gold', 'Real Estate']
+DEFAULT_ASSET_RETURNS = {
+    'Equity': 12.0,
+    'Debt': 7.0,
+    'Gold': 8.0,
+    'Real Estate': 9.0
+}
+DEFAULT_ASSET_VOLATILITIES = {
+    'Equity': 18.0,
+    'Debt': 4.0,
+    'Gold': 15.0,
+    'Real Estate': 12.0
+}
+DEFAULT_ASSET_CORRELATIONS = np.array([
+    [1.00, 0.10, -0.10, 0.50],
+    [0.10, 1.00, 0.05, 0.20],
+    [-0.10, 0.05, 1.00, 0.00],
+    [0.50, 0.20, 0.00, 1.00]
+])
+
+def build_covariance_matrix(
+    volatilities: np.ndarray,
+    correlation: np.ndarray
+) -> np.ndarray:
+    """Combine per-asset volatilities and a correlation matrix into a covariance matrix."""
+    volatilities = np.asarray(volatilities, dtype=float)
+    return np.outer(volatilities, volatilities) * np.asarray(correlation, dtype=float)
+
+def simulate_multi_asset_portfolio(
+    allocation: Dict[str, float],
+    initial_amount: float,
+    monthly_investment: float,
+    time_horizon: int,
+    expected_returns: Optional[Dict[str, float]] = None,
+    covariance: Optional[np.ndarray] = None,
+    correlation: Optional[np.ndarray] = None,
+    volatilities: Optional[Dict[str, float]] = None,
+    simulations: int = 1000,
+    rng: Optional[np.random.Generator] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Project a multi-asset portfolio with correlated Monte Carlo shocks.
+    Returns, volatilities and covariance are annual and in % units (cov in %^2),
+    ordered like `allocation`. Pass either `covariance` or `correlation`
+    (with `volatilities`); defaults cover the ASSET_CLASSES buckets.
+    Initial amount and SIP are split by the allocation weights.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    
+    assets = list(allocation)
+    weights = np.array([allocation[a] for a in assets], dtype=float)
+    weights = weights / weights.sum()
+    
+    expected_returns = expected_returns or DEFAULT_ASSET_RETURNS
+    annual_returns = np.array([expected_returns[a] for a in assets])
+    
+    if covariance is None:
+        volatilities = volatilities or DEFAULT_ASSET_VOLATILITIES
+        if correlation is None:
+            index = [ASSET_CLASSES.index(a) for a in assets]
+            correlation = DEFAULT_ASSET_CORRELATIONS[np.ix_(index, index)]
+        covariance = build_covariance_matrix([volatilities[a] for a in assets], correlation)
+    
+    monthly_returns = annual_returns / 12 / 100
+    monthly_covariance = np.asarray(covariance, dtype=float) / 12 / 100**2
+    
+    # One Cholesky factorization turns independent shocks into correlated ones
+    try:
+        cholesky = np.linalg.cholesky(monthly_covariance)
+    except np.linalg.LinAlgError:
+        raise ValueError("Covariance matrix must be positive definite")
+    
+    months = time_horizon * 12
+    shocks = rng.standard_normal((simulations, months, len(assets))) @ cholesky.T
+    asset_returns = (monthly_returns + shocks).transpose(0, 2, 1)
+    
+    # Every asset path at once: (simulations x assets x months)
+    asset_values = _simulate_paths(
+        (weights * initial_amount)[:, None],
+        (weights * monthly_investment)[:, None],
+        asset_returns
+    )
+    portfolio_values = asset_values.sum(axis=1)
+    
+    percentiles = np.percentile(portfolio_values, [5, 50, 95], axis=0)
+    asset_medians = np.median(asset_values, axis=0)
+    
+    return {
+        'conservative': percentiles[0],
+        'moderate': percentiles[1],
+        'aggressive': percentiles[2],
+        'time_points': np.arange(1, months + 1),
+        'asset_medians': dict(zip(assets, asset_medians))
+    }
+
+# Registry of stress scenarios: fractional shock per asset class
+STRESS_SCENARIOS: Dict[str, Dict[str, float]] = {
+    'market_crash': {
+        'Equity': -0.30,
+        'Debt': -0.10,
+        'Gold': 0.15,
+        'Real Estate': -0.20
+    },
+    'interest_rate_hike': {
+        'Equity': -0.15,
+        'Debt': -0.20,
+        'Gold': -0.05,
+        'Real Estate': -0.10
+    },
+    'currency_crisis': {
+        'Equity': -0.20,
+        'Debt': -0.15,
+        'Gold': 0.25,
+        'Real Estate': -0.05
+    }
+}
+
+def register_stress_scenario(name: str, shocks: Dict[str, float]) -> None:
+    """Add or replace a stress scenario in the registry."""
+    STRESS_SCENARIOS[name] = {asset: float(shock) for asset, shock in shocks.items()}
+
+def load_stress_scenarios(path: str) -> List[str]:
+    """
+    Register scenarios from a JSON file shaped like STRESS_SCENARIOS,
+    e.g. {"rupee_crash": {"Equity": -0.25, "Gold": 0.20}}.
+    Returns the names that were loaded.
+    """
+    with open(path) as f:
+        scenarios = json.load(f)
+    
+    for name, shocks in scenarios.items():
+        register_stress_scenario(name, shocks)
+    
+    return list(scenarios)
+
+def _resolve_scenarios(scenarios=None) -> Dict[str, Dict[str, float]]:
+    """Map scenario names (or an explicit scenario dict) to their shocks."""
+    if scenarios is None:
+        return dict(STRESS_SCENARIOS)
+    if isinstance(scenarios, dict):
+        return scenarios
+    
+    for scenario in scenarios:
+        if scenario not in STRESS_SCENARIOS:
+            raise ValueError(f"Unknown scenario: {scenario}")
+    return {s: STRESS_SCENARIOS[s] for s in scenarios}
+
+def build_shock_matrix(
+    scenarios=None,
+    assets: Optional[List[str]] = None
+) -> np.ndarray:
+    """
+    Build an (n_scenarios x n_assets) shock matrix.
+    `scenarios` is a list of registered names or a {name: {asset: shock}} dict;
+    defaults to every registered scenario over ASSET_CLASSES. Missing shocks are 0.
+    """
+    scenarios = _resolve_scenarios(scenarios)
+    assets = assets if assets is not None else ASSET_CLASSES
+    
+    return np.array(
+        [[shocks.get(a, 0.0) for a in assets] for shocks in scenarios.values()],
+        dtype=float
+    ).reshape(len(scenarios), len(assets))
+
+def stress_test_matrix(holdings: np.ndarray, shocks: np.ndarray) -> np.ndarray:
+    """
+    Stressed total value of every portfolio under every scenario.
+    (n_portfolios x n_assets) @ (n_assets x n_scenarios) in a single matrix multiply.
+    """
+    return np.atleast_2d(holdings) @ (1 + shocks).T
+
+def run_stress_tests(
+    holdings,
+    scenarios=None,
+    assets: Optional[List[str]] = None,
+    by_asset: bool = True
+) -> pd.DataFrame:
+    """
+    Apply stress scenarios (registered names or a scenario dict, default all
+    registered) to one or many portfolios.
+    `holdings` is a portfolio dict, a DataFrame with asset columns (one row per
+    portfolio), or an (n_portfolios x n_assets) array ordered like `assets`.
+    Returns a tidy frame with Portfolio, Scenario, [Asset,] Value and Change (%),
+    ready for px.bar.
+    """
+    if isinstance(holdings, dict):
+        assets = assets or list(holdings)
+        holdings = np.array([[holdings.get(a, 0.0) for a in assets]], dtype=float)
+        portfolios = pd.Index([0])
+    elif isinstance(holdings, pd.DataFrame):
+        assets = assets or list(holdings.columns)
+        portfolios = holdings.index
+        holdings = holdings[assets].to_numpy(dtype=float)
+    else:
+        assets = assets or ASSET_CLASSES
+        holdings = np.atleast_2d(np.asarray(holdings, dtype=float))
+        portfolios = pd.RangeIndex(len(holdings))
+    
+    scenarios = _resolve_scenarios(scenarios)
+    shocks = build_shock_matrix(scenarios, assets)
+    labels = pd.Index([s.replace('_', ' ').title() for s in scenarios])
+    n_portfolios, n_scenarios, n_assets = len(holdings), len(scenarios), len(assets)
+    
+    if by_asset:
+        values = holdings[:, None, :] * (1 + shocks)[None, :, :]
+        change = np.broadcast_to(shocks[None, :, :] * 100, values.shape)
+        portfolio_codes, scenario_codes, asset_codes = np.indices(values.shape).reshape(3, -1)
+        return pd.DataFrame({
+            'Portfolio': portfolios.take(portfolio_codes),
+            'Scenario': pd.Categorical.from_codes(scenario_codes, categories=labels),
+            'Asset': pd.Categorical.from_codes(asset_codes, categories=pd.Index(assets)),
+            'Value': values.ravel(),
+            'Change': change.ravel()
+        })
+    
+    totals = stress_test_matrix(holdings, shocks)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        change = (totals / holdings.sum(axis=1, keepdims=True) - 1) * 100
+    portfolio_codes, scenario_codes = np.indices((n_portfolios, n_scenarios)).reshape(2, -1)
+    return pd.DataFrame({
+        'Portfolio': portfolios.take(portfolio_codes),
+        'Scenario': pd.Categorical.from_codes(scenario_codes, categories=labels),
+        'Value': totals.ravel(),
+        'Change': change.ravel()
+    })
+
 def stress_test_portfolio(
     portfolio: Dict[str, float],
     scenario: str
 ) -> Dict[str, float]:
     """
     Perform stress testing on portfolio under different scenarios.
-    Scenarios: market_crash, interest_rate_hike, currency_crisis
-    """
-    stress_factors = {
-        'market_crash': {
-            'Equity': -0.30,
-            'Debt': -0.10,
-            'Gold': 0.15,
-            'Real Estate': -0.20
-        },
-        'interest_rate_hike': {
-            'Equity': -0.15,
-            'Debt': -0.20,
-            'Gold': -0.05,
-            'Real Estate': -0.10
-        },
-        'currency_crisis': {
-            'Equity': -0.20,
-            'Debt': -0.15,
-            'Gold': 0.25,
-            'Real Estate': -0.05
-        }
-    }
-    
-    if scenario not in stress_factors:
+    Scenarios: any name in STRESS_SCENARIOS (market_crash, interest_rate_hike,
+    currency_crisis by default).
+    """
+    if scenario not in STRESS_SCENARIOS:
         raise ValueError(f"Unknown scenario: {scenario}")
     
     stressed_portfolio = {}
     for asset, amount in portfolio.items():
-        factor = stress_factors[scenario].get(asset, 0)
+        factor = STRESS_SCENARIOS[scenario].get(asset, 0)
         stressed_portfolio[asset] = amount * (1 + factor)
     
     return stressed_portfolio
 
-def calculate_portfolio_metrics(
-    portfolio: Dict[str, float],
-    returns: Dict[str, float],
-    risks: Dict[str, float]
-) -> Dict[str, float]:
+def calculate_portfolio_metrics_batch(
+    holdings: np.ndarray,
+    returns: np.ndarray,
+    risks: Optional[np.ndarray] = None,
+    covariance: Optional[np.ndarray] = None,
+    risk_free_rate: float = 0.04
+) -> Dict[str, np.ndarray]:
     """
-    Calculate advanced portfolio metrics including Sharpe ratio,
-    diversification score, and risk contribution.
+    Calculate portfolio metrics for many portfolios in one vectorized pass.
+    `holdings` is (n_portfolios x n_assets) amounts or weights; each row is
+    normalized to weights. `returns` and `risks` are per-asset vectors (or
+    per-portfolio matrices). If `covariance` is given, risk uses the full
+    covariance matrix instead of the uncorrelated sum of w^2 * sigma^2.
     """
-    total_value = sum(portfolio.values())
-    weights = {k: v/total_value for k, v in portfolio.items()}
+    holdings = np.atleast_2d(np.asarray(holdings, dtype=float))
+    weights = holdings / holdings.sum(axis=1, keepdims=True)
     
     # Expected portfolio return
-    portfolio_return = sum(weights[k] * returns[k] for k in weights)
+    portfolio_return = np.sum(weights * np.asarray(returns, dtype=float), axis=1)
     
-    # Portfolio risk (simplified)
-    portfolio_risk = np.sqrt(sum(weights[k]**2 * risks[k]**2 for k in weights))
+    # Portfolio risk
+    if covariance is not None:
+        variance = np.sum((weights @ np.asarray(covariance, dtype=float)) * weights, axis=1)
+    elif risks is not None:
+        variance = np.sum(weights**2 * np.asarray(risks, dtype=float)**2, axis=1)
+    else:
+        raise ValueError("Either risks or covariance is required")
+    portfolio_risk = np.sqrt(variance)
     
-    # Sharpe ratio (assuming 4% risk-free rate for India)
-    risk_free_rate = 0.04
+    # Sharpe ratio (4% risk-free rate for India by default)
     sharpe_ratio = (portfolio_return - risk_free_rate) / portfolio_risk
     
     # Diversification score (1 = perfectly diversified, 0 = concentrated)
-    diversification = 1 - sum(w**2 for w in weights.values())
+    diversification = 1 - np.sum(weights**2, axis=1)
     
     return {
         'expected_return': portfolio_return,
@@ -120,6 +722,172 @@ def calculate_portfolio_metrics(
         'diversification_score': diversification
     }
 
+def calculate_portfolio_metrics(
+    portfolio: Dict[str, float],
+    returns: Dict[str, float],
+    risks: Dict[str, float],
+    covariance: Optional[np.ndarray] = None
+) -> Dict[str, float]:
+    """
+    Calculate advanced portfolio metrics including Sharpe ratio,
+    diversification score, and risk contribution.
+    `covariance`, if given, is ordered like `portfolio`.
+    """
+    assets = list(portfolio)
+    metrics = calculate_portfolio_metrics_batch(
+        np.array([[portfolio[k] for k in assets]]),
+        np.array([returns[k] for k in assets]),
+        np.array([risks[k] for k in assets]),
+        covariance
+    )
+    return {name: float(values[0]) for name, values in metrics.items()}
+
+def _max_return_weights(
+    returns: np.ndarray,
+    lower: np.ndarray,
+    upper: np.ndarray
+) -> np.ndarray:
+    """Highest-return fully invested weights under box bounds (greedy fill)."""
+    weights = lower.copy()
+    remaining = 1 - weights.sum()
+    for i in np.argsort(-returns):
+        add = min(upper[i] - weights[i], remaining)
+        weights[i] += add
+        remaining -= add
+    return weights
+
+@lru_cache(maxsize=32)
+def _solve_efficient_frontier(
+    assets: Tuple[str, ...],
+    returns_key: Tuple[float, ...],
+    covariance_key: Tuple[Tuple[float, ...], ...],
+    lower_key: Tuple[float, ...],
+    upper_key: Tuple[float, ...],
+    points: int,
+    risk_free_rate: float
+) -> Dict:
+    """Solve and cache the frontier for one return/covariance/bounds set."""
+    returns = np.array(returns_key)
+    covariance = np.array(covariance_key)
+    lower = np.array(lower_key)
+    upper = np.array(upper_key)
+    bounds = list(zip(lower, upper))
+    budget = {'type': 'eq', 'fun': lambda w: w.sum() - 1, 'jac': lambda w: np.ones_like(w)}
+    
+    def variance(w: np.ndarray) -> float:
+        return w @ covariance @ w
+    
+    def variance_gradient(w: np.ndarray) -> np.ndarray:
+        return 2 * covariance @ w
+    
+    # Global minimum-variance portfolio anchors the low end of the frontier
+    start = np.clip(np.full(len(assets), 1 / len(assets)), lower, upper)
+    min_variance = minimize(
+        variance, start, jac=variance_gradient, bounds=bounds,
+        constraints=[budget], method='SLSQP'
+    ).x
+    targets = np.linspace(
+        returns @ min_variance,
+        returns @ _max_return_weights(returns, lower, upper),
+        points
+    )
+    
+    # Walk up the frontier, warm-starting each point from the previous solution
+    frontier = [min_variance]
+    for target in targets[1:]:
+        on_target = {'type': 'eq', 'fun': lambda w, t=target: returns @ w - t, 'jac': lambda w: returns}
+        solution = minimize(
+            variance, frontier[-1], jac=variance_gradient, bounds=bounds,
+            constraints=[budget, on_target], method='SLSQP'
+        )
+        frontier.append(solution.x)
+    weights = np.clip(np.array(frontier), lower, upper)
+    
+    metrics = calculate_portfolio_metrics_batch(
+        weights, returns, covariance=covariance, risk_free_rate=risk_free_rate
+    )
+    
+    # Tangency portfolio, warm-started from the best frontier point
+    def negative_sharpe(w: np.ndarray) -> float:
+        return -(returns @ w - risk_free_rate) / np.sqrt(variance(w))
+    
+    tangency = minimize(
+        negative_sharpe, weights[np.argmax(metrics['sharpe_ratio'])], bounds=bounds,
+        constraints=[budget], method='SLSQP'
+    ).x
+    tangency = np.clip(tangency, lower, upper)
+    tangency_metrics = calculate_portfolio_metrics_batch(
+        tangency, returns, covariance=covariance, risk_free_rate=risk_free_rate
+    )
+    
+    for values in [weights, tangency, *metrics.values()]:
+        values.setflags(write=False)
+    
+    return {
+        'assets': list(assets),
+        'weights': weights,
+        'returns': metrics['expected_return'],
+        'risks': metrics['risk'],
+        'sharpe_ratios': metrics['sharpe_ratio'],
+        'tangency': {
+            'weights': dict(zip(assets, tangency.tolist())),
+            'expected_return': float(tangency_metrics['expected_return'][0]),
+            'risk': float(tangency_metrics['risk'][0]),
+            'sharpe_ratio': float(tangency_metrics['sharpe_ratio'][0])
+        }
+    }
+
+def calculate_efficient_frontier(
+    expected_returns: Optional[Dict[str, float]] = None,
+    covariance: Optional[np.ndarray] = None,
+    min_weights: Optional[Dict[str, float]] = None,
+    max_weights: Optional[Dict[str, float]] = None,
+    points: int = 25,
+    risk_free_rate: float = 0.04
+) -> Dict:
+    """
+    Compute the mean-variance efficient frontier and tangency portfolio.
+    Returns and covariance are annual decimals (as in calculate_portfolio_metrics),
+    ordered like `expected_returns`; defaults cover ASSET_CLASSES. Allocation is
+    long-only, optionally bounded per class by `min_weights` / `max_weights`.
+    Results are cached per input set, so repeated calls are free.
+    """
+    if expected_returns is None:
+        expected_returns = {a: DEFAULT_ASSET_RETURNS[a] / 100 for a in ASSET_CLASSES}
+    assets = tuple(expected_returns)
+    
+    if covariance is None:
+        index = [ASSET_CLASSES.index(a) for a in assets]
+        covariance = build_covariance_matrix(
+            [DEFAULT_ASSET_VOLATILITIES[a] / 100 for a in assets],
+            DEFAULT_ASSET_CORRELATIONS[np.ix_(index, index)]
+        )
+    
+    min_weights = min_weights or {}
+    max_weights = max_weights or {}
+    lower = tuple(float(min_weights.get(a, 0.0)) for a in assets)
+    upper = tuple(float(max_weights.get(a, 1.0)) for a in assets)
+    if sum(lower) > 1 or sum(upper) < 1:
+        raise ValueError("Allocation bounds cannot sum to a fully invested portfolio")
+    
+    frontier = _solve_efficient_frontier(
+        assets,
+        tuple(float(expected_returns[a]) for a in assets),
+        tuple(tuple(float(c) for c in row) for row in np.asarray(covariance)),
+        lower,
+        upper,
+        points,
+        float(risk_free_rate)
+    )
+    
+    # The cached result is shared; hand out fresh containers (arrays are read-only)
+    tangency = frontier['tangency']
+    return {
+        **frontier,
+        'assets': list(frontier['assets']),
+        'tangency': {**tangency, 'weights': dict(tangency['weights'])}
+    }
+
 def generate_investment_recommendations(
     risk_profile: str,
     investment_horizon: int,
@@ -0,0 +1,73 @@
+import os
+import tempfile
+import pandas as pd
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+
+# File extensions read and written as Parquet; everything else is CSV
+PARQUET_EXTENSIONS = ('.parquet', '.pq')
+
+def is_parquet(path: str) -> bool:
+    """Whether a path should be handled as Parquet."""
+    return os.path.splitext(path)[1].lower() in PARQUET_EXTENSIONS
+
+def iter_table_chunks(
+    path: str,
+    chunk_size: int,
+    columns: Optional[List[str]] = None,
+    dtype: Optional[Dict[str, type]] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream a CSV or Parquet file as DataFrames of at most `chunk_size` rows.
+    CSV dtypes are otherwise inferred per chunk, so pass `dtype` for numeric
+    columns that must not flip between int and float from one chunk to the next.
+    """
+    if is_parquet(path):
+        import pyarrow.parquet as pq  # Optional dependency, only needed for Parquet
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size, columns=columns):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size, usecols=columns, dtype=dtype)
+
+@contextmanager
+def open_table_writer(path: str) -> Iterator[Callable[[pd.DataFrame], None]]:
+    """
+    Yield a function that appends DataFrame chunks to a CSV or Parquet file,
+    so results are written incrementally instead of held in memory. Chunks go
+    to a temp file beside `path`, which replaces it only once all are written.
+    """
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+    os.close(fd)
+    parquet_writer = None
+    header_written = False
+
+    def write(chunk: pd.DataFrame) -> None:
+        nonlocal parquet_writer, header_written
+        if is_parquet(path):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if parquet_writer is None:
+                parquet_writer = pq.ParquetWriter(temp_path, table.schema)
+            else:
+                # The file's schema comes from the first chunk; later chunks must match it
+                table = table.cast(parquet_writer.schema)
+            parquet_writer.write_table(table)
+        else:
+            chunk.to_csv(temp_path, mode='a' if header_written else 'w', header=not header_written, index=False)
+        header_written = True
+
+    try:
+        yield write
+        if parquet_writer is not None:
+            parquet_writer.close()
+            parquet_writer = None
+        if header_written:
+            os.replace(temp_path, path)
+    finally:
+        if parquet_writer is not None:
+            parquet_writer.close()
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
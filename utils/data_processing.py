@@ -1,31 +1,217 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple, Union
 from utils.financial_calculations import calculate_emi
 
-def generate_loan_amortization(principal: float, rate: float, tenure: int) -> pd.DataFrame:
-    """Generate loan amortization schedule."""
+# Column order shared by every amortization output format
+AMORTIZATION_COLUMNS = ['Period', 'EMI', 'Principal', 'Interest', 'Balance']
+
+def amortization_arrays(principal: float, rate: float, tenure: int) -> Dict[str, np.ndarray]:
+    """
+    Loan amortization columns as NumPy arrays, computed directly from the
+    closed-form remaining balance B_k = P(1+r)^k - EMI((1+r)^k - 1)/r.
+    """
     rate = rate / (12 * 100)
     periods = tenure * 12
     emi = calculate_emi(principal, rate * 1200, tenure)
 
-    schedule = []
+    period = np.arange(1, periods + 1)
+    elapsed = np.arange(periods + 1)
+    if rate == 0:
+        balance = principal - emi * elapsed
+    else:
+        growth = (1 + rate) ** elapsed
+        balance = principal * growth - emi * (growth - 1) / rate
+
+    interest = balance[:-1] * rate
+    principal_paid = emi - interest
+
+    return {
+        'Period': period,
+        'EMI': np.full(periods, emi, dtype=float),
+        'Principal': principal_paid,
+        'Interest': interest,
+        'Balance': np.maximum(0, balance[1:])
+    }
+
+def generate_loan_amortization(
+    principal: float,
+    rate: float,
+    tenure: int,
+    output: str = 'dataframe'
+) -> Union[pd.DataFrame, np.ndarray, 'pyarrow.Table']:
+    """
+    Generate loan amortization schedule.
+    `output` is 'dataframe' (default), 'records' for a NumPy structured array,
+    or 'arrow' for a pyarrow Table; the last two skip DataFrame construction.
+    """
+    columns = amortization_arrays(principal, rate, tenure)
+
+    if output == 'dataframe':
+        return pd.DataFrame(columns, columns=AMORTIZATION_COLUMNS)
+    elif output == 'records':
+        schedule = np.empty(
+            len(columns['Period']),
+            dtype=[('Period', np.int64)] + [(name, np.float64) for name in AMORTIZATION_COLUMNS[1:]]
+        )
+        for name in AMORTIZATION_COLUMNS:
+            schedule[name] = columns[name]
+        return schedule
+    elif output == 'arrow':
+        import pyarrow as pa  # Optional dependency, only needed for Arrow output
+        return pa.table({name: columns[name] for name in AMORTIZATION_COLUMNS})
+
+    raise ValueError(f"Unknown output format: {output}")
+
+# Events understood by the floating-rate engine and how each can be absorbed
+LOAN_EVENT_TYPES = ['rate_reset', 'prepayment']
+LOAN_ADJUSTMENTS = ['tenure', 'emi']
+
+def _annuity_payment(balance: float, monthly_rate: float, months: int) -> float:
+    """EMI that repays `balance` over `months`, rounded like calculate_emi."""
+    if monthly_rate == 0:
+        return balance / months
+    growth = (1 + monthly_rate)**months
+    return round(balance * monthly_rate * growth / (growth - 1), 2)
+
+def _months_to_repay(balance: float, monthly_rate: float, emi: float) -> int:
+    """Months a fixed EMI needs to clear `balance` (inverse annuity)."""
+    if monthly_rate == 0:
+        return int(np.ceil(balance / emi))
+    if emi <= balance * monthly_rate:
+        raise ValueError("EMI no longer covers the monthly interest; adjust the EMI instead of the tenure")
+    return int(np.ceil(-np.log(1 - monthly_rate * balance / emi) / np.log(1 + monthly_rate) - 1e-9))
+
+@lru_cache(maxsize=4096)
+def _amortize_segment(
+    balance: float,
+    monthly_rate: float,
+    emi: float,
+    periods: int,
+    settle_last: bool
+) -> Tuple[np.ndarray, ...]:
+    """
+    Interest, principal, payment and closing balance for up to `periods` months
+    at a constant rate and EMI, stopping early at payoff. The payoff month (or
+    the last month, if `settle_last`) pays exactly what is left. Cached, so
+    unchanged segments are never recomputed.
+    """
+    elapsed = np.arange(periods + 1)
+    if monthly_rate == 0:
+        balances = balance - emi * elapsed
+    else:
+        growth = (1 + monthly_rate)**elapsed
+        balances = balance * growth - emi * (growth - 1) / monthly_rate
+
+    paid_off = np.flatnonzero(balances[1:] <= 0)
+    count = paid_off[0] + 1 if paid_off.size else periods
+
+    interest = balances[:count] * monthly_rate
+    payment = np.full(count, emi)
+    closing = balances[1:count + 1].copy()
+    if paid_off.size or settle_last:
+        payment[-1] = balances[count - 1] + interest[-1]
+        closing[-1] = 0.0
+
+    segment = (interest, payment - interest, payment, closing)
+    for values in segment:
+        values.setflags(write=False)
+    return segment
+
+def _event_boundary(event: Dict) -> int:
+    """Number of periods completed when an event takes effect."""
+    # A reset changes the rate from its period on; a prepayment follows that period's EMI
+    return event['period'] - 1 if event['type'] == 'rate_reset' else event['period']
+
+def generate_floating_rate_amortization(
+    principal: float,
+    rate: float,
+    tenure: int,
+    events: Optional[List[Dict]] = None
+) -> pd.DataFrame:
+    """
+    Event-driven amortization for floating-rate loans.
+    `events` is a list of dicts with 'period' (month, 1-based), 'type'
+    ('rate_reset' with a new annual 'rate' in %, or 'prepayment' with a lump-sum
+    'amount') and 'adjust' ('tenure' keeps the EMI, 'emi' keeps the end date).
+    Each stretch between events is computed in closed form and cached, so
+    editing an event only recomputes the schedule after it.
+    """
+    events = sorted(events or [], key=_event_boundary)
+    for event in events:
+        if event['type'] not in LOAN_EVENT_TYPES:
+            raise ValueError(f"Unknown loan event: {event['type']}")
+        if event.get('adjust', 'tenure') not in LOAN_ADJUSTMENTS:
+            raise ValueError(f"Unknown adjustment: {event['adjust']}")
+
+    annual_rate = rate
+    monthly_rate = rate / (12 * 100)
+    emi = calculate_emi(principal, rate, tenure)
     balance = principal
+    completed = 0
+    end = tenure * 12
 
-    for period in range(1, periods + 1):
-        interest = balance * rate
-        principal_paid = emi - interest
-        balance = balance - principal_paid
-
-        schedule.append({
-            'Period': period,
-            'EMI': emi,
-            'Principal': principal_paid,
-            'Interest': interest,
-            'Balance': max(0, balance)
-        })
+    segments = []
+    prepayments = {}
+    for boundary in sorted({_event_boundary(e) for e in events}):
+        # Run the schedule up to this boundary (or the current end of the loan)
+        stop = min(boundary, end)
+        if stop > completed and balance > 0:
+            interest, principal_paid, payment, closing = _amortize_segment(
+                balance, monthly_rate, emi, stop - completed, stop == end
+            )
+            segments.append((completed, annual_rate, interest, principal_paid, payment, closing))
+            completed += len(interest)
+            balance = closing[-1]
+
+        if balance <= 0 or completed >= end or completed < boundary:
+            break
+
+        # Apply every event that lands on this boundary
+        for event in [e for e in events if _event_boundary(e) == boundary]:
+            if event['type'] == 'rate_reset':
+                annual_rate = event['rate']
+                monthly_rate = annual_rate / (12 * 100)
+            else:
+                amount = min(event['amount'], balance)
+                prepayments[completed] = prepayments.get(completed, 0) + amount
+                balance -= amount
+
+            if balance <= 0:
+                break
+            if event.get('adjust', 'tenure') == 'emi':
+                emi = _annuity_payment(balance, monthly_rate, end - completed)
+            else:
+                end = completed + _months_to_repay(balance, monthly_rate, emi)
+
+        if balance <= 0:
+            break
+
+    if end > completed and balance > 0:
+        interest, principal_paid, payment, closing = _amortize_segment(
+            balance, monthly_rate, emi, end - completed, True
+        )
+        segments.append((completed, annual_rate, interest, principal_paid, payment, closing))
+
+    periods = sum(len(segment[2]) for segment in segments)
+    schedule = pd.DataFrame({
+        'Period': np.arange(1, periods + 1),
+        'EMI': np.concatenate([s[4] for s in segments]) if segments else np.empty(0),
+        'Principal': np.concatenate([s[3] for s in segments]) if segments else np.empty(0),
+        'Interest': np.concatenate([s[2] for s in segments]) if segments else np.empty(0),
+        'Prepayment': 0.0,
+        'Balance': np.concatenate([s[5] for s in segments]) if segments else np.empty(0),
+        'Rate': np.concatenate([np.full(len(s[2]), s[1]) for s in segments]) if segments else np.empty(0)
+    })
+
+    # Lump sums land on the row of the period they follow
+    for period, amount in prepayments.items():
+        schedule.loc[period - 1, 'Prepayment'] = amount
+        schedule.loc[period - 1, 'Balance'] = max(0.0, schedule.loc[period - 1, 'Balance'] - amount)
 
-    return pd.DataFrame(schedule)
+    return schedule
 
 def process_portfolio_data(investments: dict) -> pd.DataFrame:
     """Process investment portfolio data."""
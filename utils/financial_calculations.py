@@ -1,5 +1,7 @@
 import numpy as np
-from typing import Dict, List, Tuple
+import pandas as pd
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 
 def calculate_emi(principal: float, rate: float, tenure: int) -> float:
     """Calculate EMI for a loan."""
@@ -15,6 +17,50 @@ def calculate_total_interest(principal: float, emi: float, tenure: int) -> float
     total_payment = emi * tenure * 12
     return round(total_payment - principal, 2)
 
+def _round_money(values: np.ndarray) -> np.ndarray:
+    """
+    Round to 2 decimals exactly like Python's round(). np.round only differs
+    on values that sit on a half-paisa tie, so those fall back to round().
+    """
+    values = np.asarray(values, dtype=float)
+    rounded = np.round(values, 2)
+    scaled = values * 100
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if near_tie.any():
+        rounded = np.array(rounded, ndmin=1)
+        rounded[near_tie.ravel()] = [round(v, 2) for v in values[near_tie].tolist()]
+        rounded = rounded.reshape(values.shape)
+    return rounded
+
+def calculate_emi_batch(principal, rate, tenure) -> Dict[str, np.ndarray]:
+    """
+    Vectorized EMI, total interest and total payment for arrays of loans.
+    Inputs broadcast against each other; rounding and zero-rate handling
+    match calculate_emi and calculate_total_interest.
+    """
+    principal = np.asarray(principal, dtype=float)
+    annual_rate = np.asarray(rate, dtype=float)
+    tenure = np.asarray(tenure)
+
+    rate = annual_rate / (12 * 100)  # Convert annual rate to monthly
+    months = tenure * 12              # Convert years to months
+    has_rate = rate != 0
+    safe_rate = np.where(has_rate, rate, 1.0)
+
+    compounded = (1 + safe_rate)**months
+    emi = np.where(
+        has_rate,
+        _round_money(principal * safe_rate * compounded / (compounded - 1)),
+        principal / months
+    )
+    total_interest = _round_money(emi * tenure * 12 - principal)
+
+    return {
+        'emi': emi,
+        'total_interest': total_interest,
+        'total_payment': principal + total_interest
+    }
+
 def optimize_prepayment_strategy(
     principal: float, 
     rate: float, 
@@ -25,28 +71,49 @@ def optimize_prepayment_strategy(
     regular_emi = calculate_emi(principal, rate, tenure)
     regular_interest = calculate_total_interest(principal, regular_emi, tenure)
 
-    # Test different prepayment scenarios
-    best_strategy = {
-        'monthly_prepayment': 0,
-        'total_interest_saved': 0,
-        'time_saved_months': 0
+    # Total interest falls monotonically as the prepayment grows, until the loan
+    # clears in its first month. The optimum is therefore the whole surplus,
+    # capped at that first-month payoff, and needs no search.
+    payoff_prepayment = float(np.ceil(principal * (1 + rate / (12 * 100)) - regular_emi))
+    prepayment = min(float(monthly_surplus), max(payoff_prepayment, 0.0))
+    new_tenure, total_interest = solve_loan_payoff(principal, rate, tenure, regular_emi, prepayment)
+    saved = regular_interest - total_interest
+
+    if saved <= 0:
+        return {
+            'monthly_prepayment': 0,
+            'total_interest_saved': 0,
+            'time_saved_months': 0
+        }
+
+    return {
+        'monthly_prepayment': prepayment,
+        'total_interest_saved': saved,
+        'time_saved_months': tenure * 12 - int(new_tenure)
     }
 
-    for prepayment in np.arange(0, monthly_surplus + 1000, 1000):
-        new_tenure, total_interest = simulate_prepayment(
-            principal, rate, tenure, regular_emi, prepayment
-        )
-        interest_saved = regular_interest - total_interest
-        time_saved = tenure * 12 - new_tenure
+def calculate_prepayment_savings_curve(
+    principal: float,
+    rate: float,
+    tenure: int,
+    monthly_surplus: float,
+    step: float = 1000
+) -> Dict[str, np.ndarray]:
+    """Interest and time saved at every prepayment level from 0 to the surplus."""
+    regular_emi = calculate_emi(principal, rate, tenure)
+    regular_interest = calculate_total_interest(principal, regular_emi, tenure)
 
-        if interest_saved > best_strategy['total_interest_saved']:
-            best_strategy = {
-                'monthly_prepayment': prepayment,
-                'total_interest_saved': interest_saved,
-                'time_saved_months': time_saved
-            }
+    prepayments = np.arange(0, monthly_surplus + step, step)
+    new_tenure, total_interest = solve_loan_payoff(
+        principal, rate, tenure, regular_emi, prepayments
+    )
 
-    return best_strategy
+    return {
+        'monthly_prepayment': prepayments,
+        'total_interest': total_interest,
+        'interest_saved': regular_interest - total_interest,
+        'time_saved_months': tenure * 12 - new_tenure
+    }
 
 def simulate_prepayment(
     principal: float,
@@ -56,19 +123,191 @@ def simulate_prepayment(
     monthly_prepayment: float
 ) -> Tuple[int, float]:
     """Simulate loan prepayment scenario."""
-    rate = rate / (12 * 100)  # Monthly rate
-    remaining_principal = principal
-    total_interest = 0
-    months = 0
-
-    while remaining_principal > 0 and months < tenure * 12:
-        interest = remaining_principal * rate
-        principal_paid = emi - interest + monthly_prepayment
-        remaining_principal -= principal_paid
-        total_interest += interest
-        months += 1
-
-    return months, total_interest
+    months, total_interest = solve_loan_payoff(principal, rate, tenure, emi, monthly_prepayment)
+    return int(months), float(total_interest)
+
+def solve_loan_payoff(
+    principal,
+    rate,
+    tenure,
+    emi,
+    monthly_prepayment
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Closed-form payoff month and total interest for a fixed EMI plus a constant
+    monthly prepayment, in O(1) per scenario. Inputs broadcast as arrays.
+    Matches the month-by-month recurrence, including the final overpaying month.
+    """
+    principal = np.asarray(principal, dtype=float)
+    rate = np.asarray(rate, dtype=float) / (12 * 100)  # Monthly rate
+    max_months = np.asarray(tenure) * 12
+    payment = np.asarray(emi, dtype=float) + np.asarray(monthly_prepayment, dtype=float)
+    growth = 1 + rate
+    has_rate = rate != 0
+    safe_rate = np.where(has_rate, rate, 1.0)
+
+    def balance_after(months):
+        # B_m = P(1+r)^m - A((1+r)^m - 1)/r, or P - A*m without interest
+        compounded = growth ** months
+        return np.where(
+            has_rate,
+            principal * compounded - payment * (compounded - 1) / safe_rate,
+            principal - payment * months
+        )
+
+    # Payoff month from the log of the annuity equation; never if A <= r*P
+    with np.errstate(divide='ignore', invalid='ignore'):
+        exact = np.where(
+            has_rate,
+            np.log(payment / (payment - safe_rate * principal)) / np.log(growth),
+            principal / payment
+        )
+    pays_off = (payment > rate * principal) & (payment > 0)
+    months = np.where(pays_off, np.ceil(np.where(pays_off, exact, 0)), max_months)
+    months = np.clip(months, 0, max_months)
+
+    # Guard against rounding at an exact month boundary
+    months = np.where((months > 0) & (balance_after(months - 1) <= 0), months - 1, months)
+    months = np.where((months < max_months) & (balance_after(months) > 0), months + 1, months)
+    months = np.where(principal > 0, months, 0)
+
+    # Interest paid = payments made - principal retired
+    total_interest = np.where(months > 0, months * payment - principal + balance_after(months), 0.0)
+    total_interest = np.where(has_rate, total_interest, 0.0)
+
+    return months.astype(int), total_interest
+
+# Columns expected per refinance offer (rate in %, tenure in years, fee in ₹)
+REFINANCE_OFFER_COLUMNS = ['rate', 'tenure']
+
+def _annuity_factor(rate, months) -> np.ndarray:
+    """Present value of 1 paid monthly for `months` months at a monthly rate."""
+    rate = np.asarray(rate, dtype=float)
+    months = np.asarray(months, dtype=float)
+    has_rate = rate != 0
+    safe_rate = np.where(has_rate, rate, 1.0)
+    return np.where(has_rate, (1 - (1 + safe_rate)**-months) / safe_rate, months)
+
+def analyze_refinance_offers(
+    balance: float,
+    rate: float,
+    remaining_months: int,
+    offers,
+    discount_rate: float = 8.0,
+    current_emi: Optional[float] = None
+) -> pd.DataFrame:
+    """
+    Compare refinance / balance-transfer offers against the current loan in one
+    vectorized pass. `offers` is a DataFrame (or dict of columns) with rate and
+    tenure, plus an optional upfront processing_fee. Savings are discounted at
+    `discount_rate` (annual %); offers are ranked by NPV of savings.
+    """
+    offers = pd.DataFrame(offers).reset_index(drop=True)
+    missing = [c for c in REFINANCE_OFFER_COLUMNS if c not in offers.columns]
+    if missing:
+        raise ValueError(f"Refinance offers are missing columns: {missing}")
+    if balance <= 0 or remaining_months <= 0:
+        raise ValueError("Outstanding balance and remaining months must be positive")
+
+    if current_emi is None:
+        current_emi = float(calculate_emi_batch(balance, rate, remaining_months / 12)['emi'])
+    fee = offers['processing_fee'].to_numpy(dtype=float) if 'processing_fee' in offers else np.zeros(len(offers))
+    offer_months = offers['tenure'].to_numpy() * 12
+    offer_emi = calculate_emi_batch(balance, offers['rate'].to_numpy(dtype=float), offers['tenure'].to_numpy())['emi']
+
+    # NPV of savings = PV(remaining EMIs) - PV(new EMIs) - fee paid upfront
+    monthly_discount = discount_rate / (12 * 100)
+    npv_savings = (
+        current_emi * _annuity_factor(monthly_discount, remaining_months)
+        - offer_emi * _annuity_factor(monthly_discount, offer_months)
+        - fee
+    )
+
+    # Cumulative savings are piecewise linear: both loans paying until the
+    # shorter ends, then only the longer one. Break-even is the first month
+    # the cumulative savings cover the fee.
+    overlap = np.minimum(offer_months, remaining_months)
+    monthly_savings = current_emi - offer_emi
+    with np.errstate(divide='ignore', invalid='ignore'):
+        first_leg = np.where(fee > 0, np.ceil(fee / monthly_savings), 0)
+        savings_at_overlap = monthly_savings * overlap - fee
+        second_leg = overlap + np.ceil(-savings_at_overlap / current_emi)
+    break_even = np.where(
+        (monthly_savings >= 0) & (first_leg <= overlap),
+        first_leg,
+        np.where((offer_months < remaining_months) & (second_leg <= remaining_months), second_leg, np.nan)
+    )
+    total_savings = current_emi * remaining_months - offer_emi * offer_months - fee
+
+    analysis = offers.assign(
+        emi=offer_emi,
+        monthly_savings=monthly_savings,
+        total_savings=total_savings,
+        npv_savings=npv_savings,
+        break_even_month=pd.array(break_even, dtype='Float64').astype('Int64')  # NA = never breaks even
+    )
+    analysis = analysis.sort_values('npv_savings', ascending=False, kind='stable')
+    analysis.insert(0, 'rank', np.arange(1, len(analysis) + 1))
+    return analysis.reset_index(drop=True)
+
+def calculate_max_eligible_loan(
+    income,
+    rate,
+    tenure,
+    foir: float = 50.0,
+    existing_emi=0
+) -> np.ndarray:
+    """
+    Largest principal whose EMI keeps total EMIs within the FOIR cap (% of
+    monthly income), from the inverse annuity P = A(1 - (1+r)^-n)/r with
+    A = FOIR * income - existing EMIs. Inputs broadcast as arrays.
+    """
+    income = np.asarray(income, dtype=float)
+    rate = np.asarray(rate, dtype=float) / (12 * 100)  # Monthly rate
+    months = np.asarray(tenure) * 12
+    affordable_emi = np.maximum(foir / 100 * income - np.asarray(existing_emi, dtype=float), 0.0)
+    return affordable_emi * _annuity_factor(rate, months)
+
+@lru_cache(maxsize=32)
+def _eligibility_grid(
+    incomes: Tuple[float, ...],
+    tenures: Tuple[int, ...],
+    rates: Tuple[float, ...],
+    foir: float,
+    existing_emi: float
+) -> np.ndarray:
+    """Cached income x tenure x rate eligibility cube (read-only)."""
+    grid = calculate_max_eligible_loan(
+        np.array(incomes)[:, None, None],
+        np.array(rates)[None, None, :],
+        np.array(tenures)[None, :, None],
+        foir,
+        existing_emi
+    )
+    grid.setflags(write=False)
+    return grid
+
+def build_eligibility_grid(
+    incomes,
+    tenures,
+    rates,
+    foir: float = 50.0,
+    existing_emi: float = 0
+) -> Dict[str, np.ndarray]:
+    """
+    Maximum eligible loan for every income x tenure x rate combination. Grids
+    are cached, so repeated lookups (e.g. on every rerun) are free.
+    """
+    incomes = tuple(float(v) for v in np.ravel(incomes))
+    tenures = tuple(int(v) for v in np.ravel(tenures))
+    rates = tuple(round(float(v), 6) for v in np.ravel(rates))
+
+    return {
+        'income': np.array(incomes),
+        'tenure': np.array(tenures),
+        'rate': np.array(rates),
+        'max_loan': _eligibility_grid(incomes, tenures, rates, float(foir), float(existing_emi))
+    }
 
 def calculate_returns(principal: float, rate: float, time: int, frequency: str = 'annual') -> float:
     """Calculate investment returns."""
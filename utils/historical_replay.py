@@ -0,0 +1,165 @@
+import os
+import json
+import logging
+import tempfile
+import pandas as pd
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from utils.market_data import fetch_historical_data
+from utils.advanced_analytics import ASSET_CLASSES, run_stress_tests
+
+logger = logging.getLogger(__name__)
+
+# Historical drawdown windows (search range for the benchmark's peak and trough)
+REPLAY_WINDOWS = {
+    'global_financial_crisis_2008': ('2008-01-01', '2009-03-31'),
+    'taper_tantrum_2013': ('2013-05-01', '2013-09-30'),
+    'covid_crash_2020': ('2020-01-01', '2020-04-30')
+}
+
+# Index history used as a proxy for each asset class (None = no usable history)
+REPLAY_PROXIES = {
+    'Equity': '^NSEI',
+    'Debt': None,
+    'Gold': 'GOLDBEES.NS',
+    'Real Estate': '^CNXREALTY'
+}
+
+# Peak and trough dates are located on this asset class' proxy
+REPLAY_BENCHMARK = 'Equity'
+
+# Computed windows are stored here so a replay never re-downloads history
+REPLAY_CACHE_PATH = os.path.join(os.path.dirname(__file__), '..', '.cache', 'replay_scenarios.json')
+
+_replay_cache: Optional[Dict[str, Dict]] = None
+
+def _load_replay_cache() -> Dict[str, Dict]:
+    """Read the on-disk replay cache once per process."""
+    global _replay_cache
+    if _replay_cache is None:
+        if os.path.exists(REPLAY_CACHE_PATH):
+            with open(REPLAY_CACHE_PATH) as f:
+                _replay_cache = json.load(f)
+        else:
+            _replay_cache = {}
+    return _replay_cache
+
+def _save_replay_cache() -> None:
+    """Write the in-memory replay cache back to disk atomically."""
+    directory = os.path.dirname(REPLAY_CACHE_PATH)
+    os.makedirs(directory, exist_ok=True)
+    # Write beside the cache and swap it in, so readers never see a partial file
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(_load_replay_cache(), f, indent=2)
+        os.replace(temp_path, REPLAY_CACHE_PATH)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+def _close_prices(symbol: str, start: str, end: str) -> pd.Series:
+    """Daily closes for a symbol, flattening yfinance's multi-index columns."""
+    df = fetch_historical_data(
+        symbol,
+        datetime.strptime(start, '%Y-%m-%d'),
+        datetime.strptime(end, '%Y-%m-%d') + timedelta(days=1)
+    )
+    if df.empty:
+        return pd.Series(dtype=float)
+
+    close = df['Close']
+    if isinstance(close, pd.DataFrame):
+        close = close.iloc[:, 0]
+    return close.dropna()
+
+def compute_replay_shocks(name: str) -> Dict:
+    """
+    Compute peak-to-trough shocks per asset class for a REPLAY_WINDOWS entry.
+    The peak and the following trough are found on the benchmark's closes; every
+    other asset class is shocked by its own move between those two dates.
+    Classes without a proxy are left unshocked; classes whose proxy history
+    could not be fetched are also unshocked but listed under 'failed'.
+    """
+    if name not in REPLAY_WINDOWS:
+        raise ValueError(f"Unknown replay window: {name}")
+
+    start, end = REPLAY_WINDOWS[name]
+    benchmark = _close_prices(REPLAY_PROXIES[REPLAY_BENCHMARK], start, end)
+    if benchmark.empty:
+        raise ValueError(f"No benchmark history for replay window: {name}")
+
+    # Largest drawdown in the window: trough after the running peak
+    drawdown = benchmark / benchmark.cummax() - 1
+    trough_date = drawdown.idxmin()
+    peak_date = benchmark.loc[:trough_date].idxmax()
+
+    shocks = {}
+    failed = []
+    for asset in ASSET_CLASSES:
+        symbol = REPLAY_PROXIES.get(asset)
+        if symbol is None:
+            # No usable proxy by design (e.g. Debt): intentionally unshocked
+            shocks[asset] = 0.0
+            continue
+
+        prices = _close_prices(symbol, start, end)
+        if prices.empty:
+            logger.warning(f"No replay history for {asset} in {name}; leaving it unshocked.")
+            shocks[asset] = 0.0
+            failed.append(asset)
+            continue
+
+        peak_price = prices.asof(peak_date)
+        trough_price = prices.asof(trough_date)
+        shocks[asset] = float(trough_price / peak_price - 1) if peak_price > 0 else 0.0
+
+    return {
+        'window': [start, end],
+        'peak_date': peak_date.strftime('%Y-%m-%d'),
+        'trough_date': trough_date.strftime('%Y-%m-%d'),
+        'shocks': shocks,
+        'failed': failed
+    }
+
+def get_replay_scenarios(names: Optional[List[str]] = None) -> Dict[str, Dict]:
+    """
+    Cached replay windows by name, computing and persisting any that are missing.
+    A window with a failed proxy download is returned but not cached, so it is
+    retried on the next call instead of freezing a 0% shock.
+    """
+    names = names if names is not None else list(REPLAY_WINDOWS)
+    cache = _load_replay_cache()
+
+    # Recompute windows never seen before, whose search range changed, or
+    # (for caches written before failures were tracked) without a failure record
+    missing = [
+        name for name in names
+        if name not in cache
+        or cache[name].get('window') != list(REPLAY_WINDOWS.get(name, ()))
+        or cache[name].get('failed') != []
+    ]
+    replays = {name: cache[name] for name in names if name not in missing}
+    complete = []
+    for name in missing:
+        replays[name] = compute_replay_shocks(name)
+        if not replays[name]['failed']:
+            cache[name] = replays[name]
+            complete.append(name)
+    if complete:
+        _save_replay_cache()
+
+    return {name: replays[name] for name in names}
+
+def replay_stress_test(
+    holdings,
+    names: Optional[List[str]] = None,
+    by_asset: bool = True
+) -> pd.DataFrame:
+    """
+    Replay historical drawdown windows against one or many portfolios.
+    Accepts the same holdings and returns the same frame as run_stress_tests.
+    """
+    replays = get_replay_scenarios(names)
+    scenarios = {f'replay_{name}': replay['shocks'] for name, replay in replays.items()}
+    return run_stress_tests(holdings, scenarios=scenarios, by_asset=by_asset)
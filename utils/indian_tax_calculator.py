@@ -1,13 +1,65 @@
+import os
+import json
 import numpy as np
+from functools import lru_cache
 from typing import Dict, List, Optional
 from datetime import datetime, date
 
+# One JSON rule pack per financial year, e.g. data/tax_rules/FY2024-25.json
+TAX_RULES_DIR = os.path.join(os.path.dirname(__file__), '..', 'data', 'tax_rules')
+DEFAULT_FINANCIAL_YEAR = '2024-25'
+TAX_REGIMES = ['old', 'new']
+
+def available_financial_years() -> List[str]:
+    """Financial years with a rule pack on disk, oldest first."""
+    return sorted(
+        name[2:-5] for name in os.listdir(TAX_RULES_DIR)
+        if name.startswith('FY') and name.endswith('.json')
+    )
+
+@lru_cache(maxsize=None)
+def _load_rule_pack(financial_year: str) -> Dict:
+    """Parsed rule pack for a financial year (read once per process)."""
+    path = os.path.join(TAX_RULES_DIR, f'FY{financial_year}.json')
+    if not os.path.exists(path):
+        raise ValueError(f"No tax rules for FY {financial_year}")
+    with open(path) as f:
+        return json.load(f)
+
+@lru_cache(maxsize=None)
+def get_tax_rules(financial_year: str = DEFAULT_FINANCIAL_YEAR, regime: str = 'old') -> Dict:
+    """
+    Rule pack for a financial year and regime, compiled on first use into
+    read-only slab arrays (thresholds, rates, base_tax) and cached, so every
+    later call, for any year, is a dictionary lookup.
+    """
+    pack = _load_rule_pack(financial_year)
+    if regime not in pack['regimes']:
+        raise ValueError(f"Unknown tax regime for FY {financial_year}: {regime}")
+    rules = dict(pack['regimes'][regime])
+
+    for column in ('thresholds', 'rates', 'base_tax'):
+        rules[column] = np.array(rules[column], dtype=float)
+        rules[column].setflags(write=False)
+    if not (len(rules['thresholds']) == len(rules['rates']) == len(rules['base_tax'])):
+        raise ValueError(f"Slab columns differ in length for FY {financial_year} {regime} regime")
+    if np.any(np.diff(rules['thresholds']) <= 0):
+        raise ValueError(f"Slab thresholds must increase for FY {financial_year} {regime} regime")
+
+    rules.update(
+        financial_year=financial_year,
+        regime=regime,
+        deduction_limits=pack['deduction_limits']
+    )
+    return rules
+
 def calculate_80c_deduction(
     ppf_investment: float = 0,
     elss_investment: float = 0,
     life_insurance_premium: float = 0,
     nps_tier1: float = 0,
-    epf_contribution: float = 0
+    epf_contribution: float = 0,
+    financial_year: str = DEFAULT_FINANCIAL_YEAR
 ) -> Dict[str, float]:
     """Calculate deductions under section 80C."""
     total_investment = (
@@ -18,7 +70,7 @@ def calculate_80c_deduction(
         epf_contribution
     )
     
-    max_deduction = 150000  # ₹1.5 lakhs limit for 80C
+    max_deduction = get_tax_rules(financial_year)['deduction_limits']['80c']
     eligible_deduction = min(total_investment, max_deduction)
     
     return {
@@ -31,12 +83,14 @@ def calculate_80d_deduction(
     health_insurance_self: float = 0,
     health_insurance_parents: float = 0,
     preventive_health_checkup: float = 0,
-    parents_age_above_60: bool = False
+    parents_age_above_60: bool = False,
+    financial_year: str = DEFAULT_FINANCIAL_YEAR
 ) -> Dict[str, float]:
     """Calculate deductions under section 80D."""
-    max_self = 25000  # Base limit for self and family
-    max_parents = 50000 if parents_age_above_60 else 25000
-    max_preventive = 5000  # Sub-limit for preventive health checkup
+    limits = get_tax_rules(financial_year)['deduction_limits']
+    max_self = limits['80d_self']  # Base limit for self and family
+    max_parents = limits['80d_parents_senior'] if parents_age_above_60 else limits['80d_parents']
+    max_preventive = limits['80d_preventive']  # Sub-limit for preventive health checkup
     
     # Adjust preventive health checkup within limits
     preventive_self = min(preventive_health_checkup/2, max_preventive/2)
@@ -138,84 +192,184 @@ def calculate_fd_returns(
         'effective_annual_rate': round(((1 + rate/n)**(n) - 1) * 100, 2)
     }
 
+def calculate_slab_tax(income, slabs: Dict[str, np.ndarray]) -> np.ndarray:
+    """
+    Tax on an array of incomes for a slab table, in one vectorized pass: each
+    income is located in its bracket with np.searchsorted and taxed as
+    base_tax + (income - threshold) * rate.
+    """
+    income = np.asarray(income, dtype=float)
+    # side='left' keeps an income equal to a threshold in the lower bracket
+    bracket = np.clip(np.searchsorted(slabs['thresholds'], income, side='left') - 1, 0, None)
+    return slabs['base_tax'][bracket] + (income - slabs['thresholds'][bracket]) * slabs['rates'][bracket]
+
+def apply_rebate(tax, taxable_income, rules: Dict) -> np.ndarray:
+    """
+    Slab tax less the section 87A rebate. Where the pack grants marginal
+    relief, tax just above the rebate limit is capped at the income above
+    the limit, so earning one more rupee never costs more than that rupee.
+    """
+    tax = np.asarray(tax, dtype=float)
+    taxable_income = np.asarray(taxable_income, dtype=float)
+    rebate = np.where(taxable_income <= rules['rebate_limit'], np.minimum(tax, rules['max_rebate']), 0)
+    tax = tax - rebate
+    if rules['marginal_relief'] and rules['max_rebate'] > 0:
+        above = taxable_income > rules['rebate_limit']
+        tax = np.where(above, np.minimum(tax, taxable_income - rules['rebate_limit']), tax)
+    return tax
+
+def calculate_regime_tax(taxable_income, rules: Dict) -> np.ndarray:
+    """Slab tax less any section 87A rebate for a compiled rule pack."""
+    taxable_income = np.asarray(taxable_income, dtype=float)
+    return apply_rebate(calculate_slab_tax(taxable_income, rules), taxable_income, rules)
+
+def calculate_tax_liability_batch(
+    gross_income,
+    deductions_80c=0,
+    deductions_80d=0,
+    other_deductions=0,
+    regime='old',
+    financial_year: str = DEFAULT_FINANCIAL_YEAR
+) -> Dict[str, np.ndarray]:
+    """
+    Old and new regime tax, cess and total for whole arrays of taxpayers, plus
+    the recommended regime. Inputs broadcast; results match calculate_tax_liability.
+    """
+    gross_income = np.asarray(gross_income, dtype=float)
+    claimed = (
+        np.asarray(deductions_80c, dtype=float)
+        + np.asarray(deductions_80d, dtype=float)
+        + np.asarray(other_deductions, dtype=float)
+    )
+
+    result = {}
+    for name in TAX_REGIMES:
+        rules = get_tax_rules(financial_year, name)
+        # A regime that takes itemised deductions only gets them, and its
+        # standard deduction, when it is the regime being filed under
+        if rules['allows_deductions']:
+            applies = np.asarray(regime) == name
+            total_deductions = np.where(applies, claimed + rules['standard_deduction'], 0)
+        else:
+            applies = True
+            total_deductions = rules['standard_deduction']
+
+        taxable_income = np.maximum(0, gross_income - total_deductions)
+        tax = calculate_regime_tax(taxable_income, rules)
+        cess = tax * rules['cess_rate']
+
+        result[f'{name}_taxable_income'] = np.where(applies, taxable_income, gross_income)
+        result[f'{name}_tax_amount'] = tax
+        result[f'{name}_cess'] = cess
+        result[f'{name}_total_tax'] = tax + cess
+
+    result['recommended_regime'] = np.where(result['old_total_tax'] < result['new_total_tax'], 'old', 'new')
+    return result
+
 def calculate_tax_liability(
     gross_income: float,
     deductions_80c: float = 0,
     deductions_80d: float = 0,
     other_deductions: float = 0,
-    regime: str = 'old'
+    regime: str = 'old',
+    financial_year: str = DEFAULT_FINANCIAL_YEAR
 ) -> Dict[str, float]:
     """Calculate income tax liability under both old and new tax regimes."""
-    
-    # Standard deduction
-    standard_deduction = 50000 if regime == 'old' else 0
-    
-    # Calculate taxable income
-    total_deductions = (
-        deductions_80c +
-        deductions_80d +
-        other_deductions +
-        standard_deduction
-    ) if regime == 'old' else 0
-    
-    taxable_income = max(0, gross_income - total_deductions)
-    
-    # Tax slabs for Old Regime
-    old_regime_tax = calculate_old_regime_tax(taxable_income)
-    
-    # Tax slabs for New Regime
-    new_regime_tax = calculate_new_regime_tax(gross_income)
-    
-    # Calculate cess (4% on tax)
-    old_regime_cess = old_regime_tax * 0.04
-    new_regime_cess = new_regime_tax * 0.04
-    
+    batch = calculate_tax_liability_batch(
+        gross_income,
+        deductions_80c,
+        deductions_80d,
+        other_deductions,
+        regime,
+        financial_year
+    )
+
     return {
         'old_regime': {
-            'taxable_income': taxable_income if regime == 'old' else gross_income,
-            'tax_amount': old_regime_tax,
-            'cess': old_regime_cess,
-            'total_tax': old_regime_tax + old_regime_cess
+            'taxable_income': float(batch['old_taxable_income']),
+            'tax_amount': float(batch['old_tax_amount']),
+            'cess': float(batch['old_cess']),
+            'total_tax': float(batch['old_total_tax'])
         },
         'new_regime': {
-            'taxable_income': gross_income,
-            'tax_amount': new_regime_tax,
-            'cess': new_regime_cess,
-            'total_tax': new_regime_tax + new_regime_cess
+            'taxable_income': float(batch['new_taxable_income']),
+            'tax_amount': float(batch['new_tax_amount']),
+            'cess': float(batch['new_cess']),
+            'total_tax': float(batch['new_total_tax'])
         },
-        'recommended_regime': 'old' if (old_regime_tax + old_regime_cess) < (new_regime_tax + new_regime_cess) else 'new'
+        'recommended_regime': str(batch['recommended_regime'])
     }
 
-def calculate_old_regime_tax(taxable_income: float) -> float:
+def calculate_old_regime_tax(taxable_income: float, financial_year: str = DEFAULT_FINANCIAL_YEAR) -> float:
     """Calculate tax under old regime."""
-    tax = 0
-    
-    if taxable_income <= 250000:
-        return 0
-    elif taxable_income <= 500000:
-        tax = (taxable_income - 250000) * 0.05
-    elif taxable_income <= 1000000:
-        tax = 12500 + (taxable_income - 500000) * 0.20
-    else:
-        tax = 112500 + (taxable_income - 1000000) * 0.30
-    
-    return tax
+    return float(calculate_regime_tax(taxable_income, get_tax_rules(financial_year, 'old')))
 
-def calculate_new_regime_tax(taxable_income: float) -> float:
+def calculate_new_regime_tax(taxable_income: float, financial_year: str = DEFAULT_FINANCIAL_YEAR) -> float:
     """Calculate tax under new regime."""
-    tax = 0
-    
-    if taxable_income <= 300000:
-        return 0
-    elif taxable_income <= 600000:
-        tax = (taxable_income - 300000) * 0.05
-    elif taxable_income <= 900000:
-        tax = 15000 + (taxable_income - 600000) * 0.10
-    elif taxable_income <= 1200000:
-        tax = 45000 + (taxable_income - 900000) * 0.15
-    elif taxable_income <= 1500000:
-        tax = 90000 + (taxable_income - 1200000) * 0.20
-    else:
-        tax = 150000 + (taxable_income - 1500000) * 0.30
-    
-    return tax
+    return float(calculate_regime_tax(taxable_income, get_tax_rules(financial_year, 'new')))
+
+def _allocation_axis(cap: float, budget: float, step: float) -> np.ndarray:
+    """Grid of amounts for one instrument: every step up to its cap, plus the cap and the budget."""
+    top = min(cap, budget)
+    return np.unique(np.r_[np.arange(0, top, step), top])
+
+def optimize_deduction_allocation(
+    gross_income: float,
+    budget: float,
+    other_deductions: float = 0,
+    existing_80c: float = 0,
+    existing_80d: float = 0,
+    financial_year: str = DEFAULT_FINANCIAL_YEAR,
+    step: float = 1000,
+    elss_share: float = 0.5
+) -> Dict[str, Dict[str, float]]:
+    """
+    Split a savings budget across 80C (PPF/ELSS), NPS under 80CCD(1B) and
+    health insurance under 80D to minimize tax, evaluating the whole allocation
+    grid in one vectorized pass. Ties on tax go to the smallest spend. PPF and
+    ELSS are interchangeable for tax, so the 80C amount is split by `elss_share`.
+    Existing 80C/80D claims count towards their caps, so only the headroom left
+    under each cap is allocated; the returned amounts are the new investments.
+    """
+    if budget < 0:
+        raise ValueError("Savings budget cannot be negative")
+    limits = get_tax_rules(financial_year)['deduction_limits']
+
+    section_80c, nps, health = np.meshgrid(
+        _allocation_axis(max(limits['80c'] - existing_80c, 0), budget, step),
+        _allocation_axis(limits['80ccd_1b'], budget, step),
+        _allocation_axis(max(limits['80d_self'] - existing_80d, 0), budget, step),
+        indexing='ij'
+    )
+    spend = section_80c + nps + health
+    feasible = spend <= budget
+    section_80c, nps, health, spend = section_80c[feasible], nps[feasible], health[feasible], spend[feasible]
+
+    allocations = {}
+    for regime in TAX_REGIMES:
+        tax = np.broadcast_to(calculate_tax_liability_batch(
+            gross_income,
+            existing_80c + section_80c,
+            existing_80d + health,
+            other_deductions + nps,
+            regime,
+            financial_year
+        )[f'{regime}_total_tax'], spend.shape)
+        # Minimum tax (to the paisa) first, then minimum spend
+        best = np.lexsort((spend, np.round(tax, 2)))[0]
+        baseline = tax[spend == 0][0]
+
+        allocations[regime] = {
+            'ppf': float(section_80c[best] * (1 - elss_share)),
+            'elss': float(section_80c[best] * elss_share),
+            'nps': float(nps[best]),
+            'health_insurance': float(health[best]),
+            'total_investment': float(spend[best]),
+            'total_tax': float(tax[best]),
+            'tax_saved': float(baseline - tax[best])
+        }
+
+    allocations['recommended_regime'] = (
+        'old' if allocations['old']['total_tax'] < allocations['new']['total_tax'] else 'new'
+    )
+    return allocations
@@ -0,0 +1,99 @@
+import time
+import pandas as pd
+from typing import Any, Callable, Dict, List, Tuple
+from utils.financial_calculations import (
+    calculate_emi,
+    calculate_total_interest,
+    optimize_prepayment_strategy,
+    calculate_prepayment_savings_curve,
+    get_loan_recommendations
+)
+from utils.data_processing import generate_loan_amortization
+
+class LoanSession:
+    """
+    Loan Calculator what-if model that caches every computation stage and
+    recomputes a stage only when its own inputs change. For example, editing
+    the monthly income reruns the recommendations but not the amortization.
+    """
+
+    # Stage name -> label shown in the stats table
+    STAGES = {
+        'emi': 'EMI',
+        'total_interest': 'Total Interest',
+        'prepayment': 'Prepayment Analysis',
+        'recommendations': 'Recommendations',
+        'amortization': 'Amortization Schedule'
+    }
+
+    def __init__(self):
+        self._cache: Dict[str, Tuple[Tuple, Any]] = {}
+        self.stats = {
+            stage: {'hits': 0, 'misses': 0, 'last_ms': 0.0, 'total_ms': 0.0}
+            for stage in self.STAGES
+        }
+
+    def _stage(self, name: str, func: Callable, *inputs) -> Any:
+        """Return the cached stage result, recomputing only if its inputs changed."""
+        stats = self.stats[name]
+        cached = self._cache.get(name)
+        if cached is not None and cached[0] == inputs:
+            stats['hits'] += 1
+            stats['last_ms'] = 0.0
+            return cached[1]
+
+        start = time.perf_counter()
+        result = func(*inputs)
+        elapsed = (time.perf_counter() - start) * 1000
+
+        stats['misses'] += 1
+        stats['last_ms'] = elapsed
+        stats['total_ms'] += elapsed
+        self._cache[name] = (inputs, result)
+        return result
+
+    def emi(self, principal: float, rate: float, tenure: int) -> float:
+        return self._stage('emi', calculate_emi, principal, rate, tenure)
+
+    def total_interest(self, principal: float, emi: float, tenure: int) -> float:
+        return self._stage('total_interest', calculate_total_interest, principal, emi, tenure)
+
+    def prepayment(
+        self,
+        principal: float,
+        rate: float,
+        tenure: int,
+        monthly_surplus: float
+    ) -> Tuple[Dict[str, float], Dict]:
+        """Optimal prepayment strategy and the full savings curve."""
+        def analyse(*inputs) -> Tuple[Dict[str, float], Dict]:
+            return (
+                optimize_prepayment_strategy(*inputs),
+                calculate_prepayment_savings_curve(*inputs)
+            )
+
+        return self._stage('prepayment', analyse, principal, rate, tenure, monthly_surplus)
+
+    def recommendations(
+        self,
+        income: float,
+        emi: float,
+        existing_liabilities: float = 0
+    ) -> List[Dict[str, str]]:
+        return self._stage('recommendations', get_loan_recommendations, income, emi, existing_liabilities)
+
+    def amortization(self, principal: float, rate: float, tenure: int) -> pd.DataFrame:
+        return self._stage('amortization', generate_loan_amortization, principal, rate, tenure)
+
+    def stats_frame(self) -> pd.DataFrame:
+        """Per-stage cache hits, misses and compute time for display."""
+        return pd.DataFrame([
+            {
+                'Stage': self.STAGES[stage],
+                'Cache Hits': stats['hits'],
+                'Recomputes': stats['misses'],
+                'Last Run (ms)': round(stats['last_ms'], 3),
+                'Total Compute (ms)': round(stats['total_ms'], 3)
+            }
+            for stage, stats in self.stats.items()
+        ])
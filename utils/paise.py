@@ -0,0 +1,174 @@
+import numpy as np
+from decimal import Decimal, ROUND_HALF_UP, localcontext
+from typing import Dict
+
+# Annual rates are held as integers in ten-thousandths of a percent (8.125% -> 81250)
+RATE_SCALE = 10_000
+
+# Monthly interest = balance * rate_units / MONTHLY_RATE_DIVISOR
+MONTHLY_RATE_DIVISOR = 12 * 100 * RATE_SCALE
+
+def to_paise(rupees) -> np.ndarray:
+    """Rupee amounts as int64 paise, rounding half-paise up."""
+    return np.floor(np.asarray(rupees, dtype=float) * 100 + 0.5).astype(np.int64)
+
+def to_rupees(paise) -> np.ndarray:
+    """int64 paise back to rupees for display."""
+    return np.asarray(paise, dtype=np.int64) / 100
+
+def rate_to_units(rate) -> np.ndarray:
+    """Annual rates in % as int64 rate units (see RATE_SCALE)."""
+    return np.floor(np.asarray(rate, dtype=float) * RATE_SCALE + 0.5).astype(np.int64)
+
+def _divide_half_up(numerator: np.ndarray, denominator) -> np.ndarray:
+    """Integer division of non-negative int64 values, rounding halves up."""
+    return (2 * numerator + denominator) // (2 * denominator)
+
+def _reference_emi(principal: int, rate_units: int, months: int) -> int:
+    """EMI in paise computed exactly with Decimal and rounded half up."""
+    with localcontext() as ctx:
+        ctx.prec = 50
+        if rate_units == 0:
+            emi = Decimal(principal) / months
+        else:
+            rate = Decimal(rate_units) / MONTHLY_RATE_DIVISOR
+            compounded = (1 + rate) ** months
+            emi = Decimal(principal) * rate * compounded / (compounded - 1)
+        return int(emi.quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+def emi_paise(principal, rate_units, months) -> np.ndarray:
+    """
+    EMI in whole paise for int64 paise principals, integer rate units and
+    tenures in months. Evaluated in floating point and rounded half up; the
+    rare results within float error of a half-paisa tie are redone in Decimal.
+    Float error grows with the EMI, so that window is relative to its size.
+    """
+    principal, rate_units, months = np.broadcast_arrays(
+        np.asarray(principal, dtype=np.int64),
+        np.asarray(rate_units, dtype=np.int64),
+        np.asarray(months, dtype=np.int64)
+    )
+    rate = rate_units / MONTHLY_RATE_DIVISOR
+    has_rate = rate_units != 0
+    safe_rate = np.where(has_rate, rate, 1.0)
+    # P * r / (1 - (1 + r)^-n), with log1p/expm1 so tiny rates keep full precision
+    exact = np.where(
+        has_rate,
+        principal * safe_rate / -np.expm1(-months * np.log1p(safe_rate)),
+        principal / np.maximum(months, 1)
+    )
+
+    emi = np.floor(exact + 0.5).astype(np.int64)
+    near_tie = np.abs(exact - np.floor(exact) - 0.5) < np.maximum(1e-12 * exact, 1e-6)
+    for index in zip(*np.nonzero(near_tie)):
+        emi[index] = _reference_emi(int(principal[index]), int(rate_units[index]), int(months[index]))
+    return emi
+
+def _amortize_paise(principal, rate_units, months, emi, record: bool = False) -> Dict[str, np.ndarray]:
+    """
+    Month-by-month integer amortization, vectorized over loans. Interest is
+    rounded half up to the paisa each month and the last instalment clears
+    whatever balance is left, as on a bank statement.
+    """
+    # Longest loans first, so the loans still running are always a prefix
+    order = np.argsort(-months, kind='stable')
+    balance = principal[order]
+    rates = rate_units[order]
+    remaining = months[order]
+    payment = emi[order]
+    running = np.searchsorted(-remaining, -np.arange(int(remaining.max(initial=0))), side='right')
+
+    total_interest = np.zeros_like(balance)
+    final_payment = np.zeros_like(balance)
+    history = []
+
+    for month, count in enumerate(running):
+        live = slice(0, count)
+        owed = balance[live]
+        interest = _divide_half_up(owed * rates[live], MONTHLY_RATE_DIVISOR)
+        interest[owed <= 0] = 0
+        repaid = payment[live] - interest
+        last = (remaining[live] == month + 1) | (repaid >= owed)
+        repaid[last] = owed[last]
+        repaid[owed <= 0] = 0
+
+        owed -= repaid
+        total_interest[live] += interest
+        settled = last & (repaid > 0)
+        final_payment[live][settled] = (repaid + interest)[settled]
+        if record:
+            history.append((repaid + interest, repaid, interest, owed.copy()))
+
+    result = {
+        'emi': emi,
+        'total_interest': np.empty_like(total_interest),
+        'final_payment': np.empty_like(final_payment)
+    }
+    result['total_interest'][order] = total_interest
+    result['final_payment'][order] = final_payment
+    result['total_payment'] = principal + result['total_interest']
+    if record:
+        payment, repaid, interest, balance = (np.array(column) for column in zip(*history))
+        result.update(payment=payment, principal=repaid, interest=interest, balance=balance)
+    return result
+
+def loan_summary_paise(principal, rate, tenure) -> Dict[str, np.ndarray]:
+    """
+    EMI, total interest, total payment and the final (settling) instalment in
+    int64 paise for arrays of loans (principal in ₹, rate in %, tenure in years).
+    """
+    principal = np.atleast_1d(to_paise(principal))
+    rate_units = np.atleast_1d(rate_to_units(rate))
+    months = np.atleast_1d(np.asarray(tenure, dtype=np.int64) * 12)
+    principal, rate_units, months = (
+        np.array(a) for a in np.broadcast_arrays(principal, rate_units, months)
+    )
+    emi = emi_paise(principal, rate_units, months)
+    return _amortize_paise(principal, rate_units, months, emi)
+
+def amortization_schedule_paise(principal: float, rate: float, tenure: int) -> Dict[str, np.ndarray]:
+    """Per-month payment, principal, interest and balance in paise for one loan."""
+    principal = np.atleast_1d(to_paise(principal))
+    rate_units = np.atleast_1d(rate_to_units(rate))
+    months = np.atleast_1d(np.int64(tenure * 12))
+    emi = emi_paise(principal, rate_units, months)
+
+    schedule = _amortize_paise(principal, rate_units, months, emi, record=True)
+    return {
+        'period': np.arange(1, len(schedule['payment']) + 1),
+        'payment': schedule['payment'][:, 0],
+        'principal': schedule['principal'][:, 0],
+        'interest': schedule['interest'][:, 0],
+        'balance': schedule['balance'][:, 0]
+    }
+
+def reference_loan_summary(principal: float, rate: float, tenure: int) -> Dict[str, int]:
+    """
+    Pure-Decimal version of loan_summary_paise for a single loan, used to
+    reconcile the vectorized kernel. Amounts are integer paise.
+    """
+    balance = int(to_paise(principal))
+    rate_units = int(rate_to_units(rate))
+    months = int(tenure) * 12
+    emi = _reference_emi(balance, rate_units, months)
+
+    total_interest = 0
+    final_payment = 0
+    for month in range(months):
+        if balance <= 0:
+            break
+        interest = int(
+            (Decimal(balance) * rate_units / MONTHLY_RATE_DIVISOR).quantize(Decimal(1), rounding=ROUND_HALF_UP)
+        )
+        repaid = balance if month == months - 1 or emi - interest >= balance else emi - interest
+        balance -= repaid
+        total_interest += interest
+        if balance == 0:
+            final_payment = repaid + interest
+
+    return {
+        'emi': emi,
+        'total_interest': total_interest,
+        'total_payment': int(to_paise(principal)) + total_interest,
+        'final_payment': final_payment
+    }
@@ -0,0 +1,144 @@
+"""
+Command-line batch runner for income-tax liability over employee files.
+
+    python -m utils.tax_batch employees.csv liabilities.parquet --workers 4
+    python -m utils.tax_batch amended.csv recomputed.csv --financial-year 2024-25
+"""
+import os
+import sys
+import time
+import argparse
+import pandas as pd
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+from utils.batch_io import iter_table_chunks, open_table_writer
+from utils.indian_tax_calculator import DEFAULT_FINANCIAL_YEAR, TAX_REGIMES, calculate_tax_liability_batch
+
+# Required input column; the deduction and regime columns are optional, and a
+# financial_year column overrides the run's year per row (e.g. amended returns)
+TAX_INCOME_COLUMN = 'gross_income'
+TAX_YEAR_COLUMN = 'financial_year'
+TAX_REGIME_COLUMN = 'regime'
+TAX_OPTIONAL_COLUMNS = {
+    'deductions_80c': 0,
+    'deductions_80d': 0,
+    'other_deductions': 0,
+    TAX_REGIME_COLUMN: 'old'
+}
+# Amounts read as float in every CSV chunk, so Parquet output keeps one schema
+TAX_DTYPES = {
+    column: float for column in [TAX_INCOME_COLUMN, 'deductions_80c', 'deductions_80d', 'other_deductions']
+}
+
+def compute_tax_chunk(employees: pd.DataFrame, financial_year: str = DEFAULT_FINANCIAL_YEAR) -> pd.DataFrame:
+    """Add old- and new-regime liability columns to a chunk of employee records."""
+    if TAX_INCOME_COLUMN not in employees.columns:
+        raise ValueError(f"Employee file is missing column: {TAX_INCOME_COLUMN}")
+
+    blank = employees.index[employees[TAX_INCOME_COLUMN].isna()]
+    if len(blank):
+        raise ValueError(
+            f"{len(blank)} employee rows have no {TAX_INCOME_COLUMN} (first rows: {blank[:5].tolist()})"
+        )
+
+    if TAX_REGIME_COLUMN in employees.columns:
+        # Accept 'OLD', ' Old ' etc., but never let a typo fall through to the new regime
+        regimes = employees[TAX_REGIME_COLUMN].fillna(TAX_OPTIONAL_COLUMNS[TAX_REGIME_COLUMN])
+        regimes = regimes.astype(str).str.strip().str.lower()
+        unknown = employees.index[~regimes.isin(TAX_REGIMES)]
+        if len(unknown):
+            raise ValueError(
+                f"{len(unknown)} employee rows have a {TAX_REGIME_COLUMN} other than {TAX_REGIMES} "
+                f"(first rows: {unknown[:5].tolist()})"
+            )
+        employees = employees.assign(**{TAX_REGIME_COLUMN: regimes})
+
+    if TAX_YEAR_COLUMN in employees.columns:
+        years = employees[TAX_YEAR_COLUMN].fillna(financial_year).astype(str)
+        inputs = employees.drop(columns=TAX_YEAR_COLUMN)
+        liability = pd.concat([
+            compute_tax_chunk(group, year).drop(columns=inputs.columns)
+            for year, group in inputs.groupby(years, sort=False)
+        ])
+        return employees.join(liability)
+
+    inputs = {
+        column: employees[column].fillna(default).to_numpy() if column in employees.columns else default
+        for column, default in TAX_OPTIONAL_COLUMNS.items()
+    }
+    liability = calculate_tax_liability_batch(
+        employees[TAX_INCOME_COLUMN].to_numpy(dtype=float),
+        financial_year=financial_year,
+        **inputs
+    )
+    return employees.assign(**liability)
+
+def run_tax_batch(
+    input_path: str,
+    output_path: str,
+    chunk_size: int = 100000,
+    workers: Optional[int] = None,
+    financial_year: str = DEFAULT_FINANCIAL_YEAR
+) -> dict:
+    """
+    Compute tax liability for a CSV/Parquet employee file chunk by chunk.
+    Chunks are spread across a process pool with at most two per worker in
+    flight, and results are written in input order as they complete.
+    """
+    workers = workers or os.cpu_count() or 1
+    rows = 0
+    start = time.perf_counter()
+
+    with open_table_writer(output_path) as write:
+        if workers == 1:
+            for employees in iter_table_chunks(input_path, chunk_size, dtype=TAX_DTYPES):
+                result = compute_tax_chunk(employees, financial_year)
+                write(result)
+                rows += len(result)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                pending = deque()
+                for employees in iter_table_chunks(input_path, chunk_size, dtype=TAX_DTYPES):
+                    # Bound memory: wait for the oldest chunk before reading further
+                    if len(pending) >= 2 * workers:
+                        result = pending.popleft().result()
+                        write(result)
+                        rows += len(result)
+                    pending.append(pool.submit(compute_tax_chunk, employees, financial_year))
+
+                while pending:
+                    result = pending.popleft().result()
+                    write(result)
+                    rows += len(result)
+
+    elapsed = time.perf_counter() - start
+    return {
+        'rows': rows,
+        'seconds': elapsed,
+        'rows_per_second': rows / elapsed if elapsed > 0 else 0.0
+    }
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Bulk income-tax liability under both regimes")
+    parser.add_argument('input', help="CSV or Parquet file with gross_income and optional deduction/regime columns")
+    parser.add_argument('output', help="CSV or Parquet file to write")
+    parser.add_argument('--chunk-size', type=int, default=100000, help="Employees per chunk")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument(
+        '--financial-year',
+        default=DEFAULT_FINANCIAL_YEAR,
+        help="Rule pack for rows without a financial_year column value"
+    )
+
+    args = parser.parse_args(argv)
+
+    stats = run_tax_batch(args.input, args.output, args.chunk_size, args.workers, args.financial_year)
+    print(
+        f"Computed tax for {stats['rows']:,} employees in {stats['seconds']:.2f}s "
+        f"({stats['rows_per_second']:,.0f} rows/s)"
+    )
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,194 @@
+import os
+import json
+import hashlib
+import tempfile
+import numpy as np
+from functools import lru_cache, reduce
+from math import gcd
+from typing import Dict, List
+from utils.indian_tax_calculator import (
+    DEFAULT_FINANCIAL_YEAR,
+    TAX_REGIMES,
+    apply_rebate,
+    calculate_slab_tax,
+    get_tax_rules
+)
+
+# Precomputed surfaces live here, one .npy per financial year and regime
+TAX_SURFACE_DIR = os.path.join(os.path.dirname(__file__), '..', '.cache', 'tax_surfaces')
+
+# Surface extent; inputs outside it are computed directly from the slabs
+SURFACE_MAX_INCOME = 5000000
+SURFACE_MAX_DEDUCTION = 500000
+
+def _surface_step(rules: Dict) -> int:
+    """
+    Grid step shared by both axes: the gcd of every kink offset. Slab kinks
+    sit where income - deductions - standard deduction hits a threshold, i.e.
+    on grid diagonals, so they always fall on triangle edges.
+    """
+    offsets = [int(round(t + rules['standard_deduction'])) for t in rules['thresholds']]
+    return reduce(gcd, [o for o in offsets if o > 0] + [SURFACE_MAX_INCOME, SURFACE_MAX_DEDUCTION])
+
+def _taxable_income(income, deductions, rules: Dict) -> np.ndarray:
+    """Taxable income when filing under the regime the rules belong to."""
+    claimed = np.asarray(deductions, dtype=float) if rules['allows_deductions'] else 0
+    return np.maximum(0, np.asarray(income, dtype=float) - claimed - rules['standard_deduction'])
+
+def _surface_path(financial_year: str, regime: str, rules: Dict) -> str:
+    """Cache file name, keyed by a digest of the rules so edited packs rebuild."""
+    key = json.dumps({
+        'thresholds': rules['thresholds'].tolist(),
+        'rates': rules['rates'].tolist(),
+        'base_tax': rules['base_tax'].tolist(),
+        'standard_deduction': rules['standard_deduction'],
+        'allows_deductions': rules['allows_deductions'],
+        'extent': [SURFACE_MAX_INCOME, SURFACE_MAX_DEDUCTION]
+    }, sort_keys=True)
+    digest = hashlib.sha1(key.encode()).hexdigest()[:12]
+    return os.path.join(TAX_SURFACE_DIR, f'FY{financial_year}_{regime}_{digest}.npy')
+
+def build_tax_surface(financial_year: str = DEFAULT_FINANCIAL_YEAR, regime: str = 'old') -> np.ndarray:
+    """
+    Slab tax (before rebate and cess) on an income x deduction grid, as float32.
+    Rebate and cess are applied at lookup time, so the stored surface stays
+    continuous and piecewise linear.
+    """
+    rules = get_tax_rules(financial_year, regime)
+    step = _surface_step(rules)
+    incomes = np.arange(0, SURFACE_MAX_INCOME + step, step)
+    deductions = np.arange(0, SURFACE_MAX_DEDUCTION + step, step)
+
+    taxable = _taxable_income(incomes[:, None], deductions[None, :], rules)
+    return calculate_slab_tax(np.broadcast_to(taxable, (len(incomes), len(deductions))), rules).astype(np.float32)
+
+@lru_cache(maxsize=None)
+def load_tax_surface(financial_year: str = DEFAULT_FINANCIAL_YEAR, regime: str = 'old') -> np.ndarray:
+    """Memory-mapped surface for a year and regime, building it on first use."""
+    rules = get_tax_rules(financial_year, regime)
+    path = _surface_path(financial_year, regime, rules)
+    if not os.path.exists(path):
+        os.makedirs(TAX_SURFACE_DIR, exist_ok=True)
+        # Write beside the target and rename, so concurrent readers never map a partial file
+        fd, temp_path = tempfile.mkstemp(dir=TAX_SURFACE_DIR, suffix='.npy.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.save(f, build_tax_surface(financial_year, regime))
+            os.replace(temp_path, path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+    return np.load(path, mmap_mode='r')
+
+def lookup_tax(
+    income,
+    deductions=0,
+    financial_year: str = DEFAULT_FINANCIAL_YEAR,
+    regime: str = 'old'
+) -> np.ndarray:
+    """
+    Total tax (after rebate and cess) when filing under `regime`, read off the
+    precomputed surface. Cells are split along the diagonal the slab kinks
+    follow, so linear interpolation on each triangle is exact.
+    """
+    rules = get_tax_rules(financial_year, regime)
+    surface = load_tax_surface(financial_year, regime)
+    step = _surface_step(rules)
+    income, deductions = np.broadcast_arrays(
+        np.asarray(income, dtype=float),
+        np.asarray(deductions, dtype=float)
+    )
+
+    x = income / step
+    y = deductions / step
+    inside = (x >= 0) & (y >= 0) & (x <= surface.shape[0] - 1) & (y <= surface.shape[1] - 1)
+    i = np.clip(np.floor(x).astype(int), 0, surface.shape[0] - 2)
+    j = np.clip(np.floor(y).astype(int), 0, surface.shape[1] - 2)
+    fx = x - i
+    fy = y - j
+
+    v00 = surface[i, j].astype(float)
+    v10 = surface[i + 1, j].astype(float)
+    v01 = surface[i, j + 1].astype(float)
+    v11 = surface[i + 1, j + 1].astype(float)
+    slab_tax = np.where(
+        fx >= fy,
+        v00 + fx * (v10 - v00) + fy * (v11 - v10),
+        v00 + fy * (v01 - v00) + fx * (v11 - v01)
+    )
+
+    taxable = _taxable_income(income, deductions, rules)
+    if not inside.all():
+        slab_tax = np.where(inside, slab_tax, calculate_slab_tax(taxable, rules))
+
+    return apply_rebate(slab_tax, taxable, rules) * (1 + rules['cess_rate'])
+
+def marginal_tax_rates(
+    incomes,
+    deductions: float = 0,
+    financial_year: str = DEFAULT_FINANCIAL_YEAR,
+    regime: str = 'old'
+) -> np.ndarray:
+    """Tax on the next rupee of income (incl. cess), as a fraction, from the surface."""
+    incomes = np.asarray(incomes, dtype=float)
+    return (
+        lookup_tax(incomes + 1, deductions, financial_year, regime)
+        - lookup_tax(incomes, deductions, financial_year, regime)
+    )
+
+def _relief_end(rules: Dict) -> np.ndarray:
+    """
+    Taxable income where 87A marginal relief stops binding, i.e. where slab
+    tax climbs back to the income above the rebate limit (empty without relief).
+    """
+    if not (rules['marginal_relief'] and rules['max_rebate'] > 0):
+        return np.empty(0)
+    # Solve base_tax + (t - threshold) * rate = t - rebate_limit on each slab
+    t = (rules['base_tax'] - rules['thresholds'] * rules['rates'] + rules['rebate_limit']) / (1 - rules['rates'])
+    upper = np.append(rules['thresholds'][1:], np.inf)
+    return t[(t > rules['rebate_limit']) & (t >= rules['thresholds']) & (t <= upper)]
+
+def find_breakeven_incomes(
+    deductions: float = 0,
+    financial_year: str = DEFAULT_FINANCIAL_YEAR
+) -> List[float]:
+    """
+    Incomes at which the old and new regimes cost the same for a given level of
+    claimed deductions. Tax differences are linear between the slab kinks of
+    both regimes, so each crossing is solved exactly from the surfaces.
+    """
+    kinks = [0.0, float(SURFACE_MAX_INCOME)]
+    for regime in TAX_REGIMES:
+        rules = get_tax_rules(financial_year, regime)
+        shift = rules['standard_deduction'] + (deductions if rules['allows_deductions'] else 0)
+        kinks.extend(rules['thresholds'] + shift)
+        kinks.append(rules['rebate_limit'] + shift)
+        kinks.extend(_relief_end(rules) + shift)
+    points = np.unique(np.clip(kinks, 0, SURFACE_MAX_INCOME))
+
+    def difference(incomes):
+        return (
+            lookup_tax(incomes, deductions, financial_year, 'old')
+            - lookup_tax(incomes, deductions, financial_year, 'new')
+        )
+
+    # Sample each kink and one paisa past it, since a rebate cliff jumps there
+    incomes = np.column_stack([points, points + 0.01]).ravel()[:-1]
+    gaps = difference(incomes)
+    signs = np.sign(np.round(gaps, 2))  # ignore sub-paisa float noise
+
+    # The cheaper regime flips wherever the (non-zero) sign of the gap changes
+    breakevens = []
+    last_sign = 0
+    for k in range(1, len(incomes)):
+        sign = signs[k]
+        if sign == 0:
+            continue
+        if last_sign and sign != last_sign:
+            if signs[k - 1] == 0:
+                breakevens.append(float(incomes[k - 1]))
+            else:
+                slope = (gaps[k] - gaps[k - 1]) / (incomes[k] - incomes[k - 1])
+                breakevens.append(float(incomes[k - 1] - gaps[k - 1] / slope))
+        last_sign = sign
+    return breakevens